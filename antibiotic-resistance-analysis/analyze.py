@@ -3,112 +3,192 @@
 Using Pandas and NumPy for advanced data analysis and visualization
 """
 
+import sys
+import threading
+import concurrent.futures
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from scipy import stats
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+
+# Grouping keys stored as categoricals so every groupby takes the factorized fast path
+CATEGORY_COLUMNS = ['Country', 'Bacterium', 'Antibiotic', 'Antibiotic_Class',
+                    'Sample_Source', 'Age_Group', 'Quarter']
+
+# Finest grain of the outcome cube; per-key summaries are roll-ups of it
+# (Antibiotic_Class is determined by Antibiotic, so it adds no extra cells)
+CUBE_KEYS = ['Country', 'Year', 'Bacterium', 'Antibiotic', 'Antibiotic_Class']
+
+# Narrowest dtypes that hold each numeric column: (dtype, (min, max) clip range)
+DOWNCAST = {
+    'Patient_Age': (np.uint8, (0, 100)),
+    'Hospital_Stay_Days': (np.uint8, (0, 90)),
+    'Year': (np.uint16, None),
+    'Is_Resistant': (bool, None),
+    'Patient_Died': (bool, None),
+}
 
 
 class AntibioticResistanceAnalyzer:
     """Main analyzer class for AMR surveillance data"""
     
-    def __init__(self, data_path):
-        """Load and prepare data"""
-        print("📂 Loading data...")
-        self.df = pd.read_csv(data_path)
-        self.df['Date'] = pd.to_datetime(self.df['Date'])
-        print(f"✅ Loaded {len(self.df):,} records\n")
+    def __init__(self, data_path=None, verbose=True, data=None):
+        """
+        Load and prepare data
+        
+        Args:
+            data_path: path to the surveillance Parquet file
+            verbose: print each analysis report (False for library use)
+            data: already-loaded DataFrame to share instead of re-reading data_path
+        """
+        self.verbose = verbose
+        self._local = threading.local()  # per-thread report capture (see _run_captured)
+        self._emit(["📂 Loading data..."])
+        if data is not None:
+            self.df = data.copy(deep=False)  # shallow: the caller's frame is left untouched
+        elif data_path:
+            self.df = pd.read_parquet(data_path)
+        else:
+            raise ValueError("Provide either data_path or data")
+        for col in CATEGORY_COLUMNS:
+            self.df[col] = self.df[col].astype('category')
+        for col, (dtype, clip_range) in DOWNCAST.items():
+            if clip_range is not None:
+                self.df[col] = self.df[col].clip(*clip_range)  # guard against silent overflow
+            self.df[col] = self.df[col].astype(dtype)
+        
+        # Rows of the hottest grouping keys sit contiguously, so groupbys stream over them
+        self.df = self.df.sort_values(['Country', 'Bacterium'], kind='stable').reset_index(drop=True)
+        
+        # Raw NumPy arrays of the hot columns, extracted once
+        self._is_resistant = self.df['Is_Resistant'].to_numpy()
+        self._died = self.df['Patient_Died'].to_numpy()
+        self._age = self.df['Patient_Age'].to_numpy()
+        self._stay = self.df['Hospital_Stay_Days'].to_numpy()
+        
+        # Single scan over the raw rows: outcome sums and counts per cube cell
+        self._cube = self.df.groupby(CUBE_KEYS, observed=True, sort=False).agg(
+            Resistant=('Is_Resistant', 'sum'),
+            Stay=('Hospital_Stay_Days', 'sum'),
+            Died=('Patient_Died', 'sum'),
+            N=('Sample_ID', 'count')
+        )
+        
+        # Yearly resistance rate shared by the temporal and advanced analyses
+        self._yearly_res = self._rollup('Year')['Is_Resistant'] * 100
+        self._emit([f"✅ Loaded {len(self.df):,} records\n"])
+    
+    def _emit(self, lines):
+        """Write a method's report lines to stdout in a single call"""
+        sink = getattr(self._local, 'sink', None)
+        if sink is not None:
+            sink.extend(lines)
+        elif self.verbose:
+            sys.stdout.write('\n'.join(lines) + '\n')
+    
+    def _run_captured(self, method, *args, **kwargs):
+        """Run an analysis method, returning (report_lines, result) instead of printing"""
+        self._local.sink = []
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            lines, self._local.sink = self._local.sink, None
+        return lines, result
+    
+    def _rollup(self, keys):
+        """Roll the outcome cube up to `keys` (outcome means + sample count)"""
+        sums = self._cube.groupby(level=keys, observed=True).sum()
+        return pd.DataFrame({
+            'Is_Resistant': sums['Resistant'] / sums['N'],
+            'Hospital_Stay_Days': sums['Stay'] / sums['N'],
+            'Patient_Died': sums['Died'] / sums['N'],
+            'Sample_ID': sums['N']
+        })
         
     def basic_statistics(self):
         """Calculate comprehensive statistics"""
-        print("="*70)
-        print("📊 BASIC STATISTICS")
-        print("="*70)
-        
-        print(f"\n🔢 Dataset Overview:")
-        print(f"   Total samples: {len(self.df):,}")
-        print(f"   Date range: {self.df['Date'].min().date()} to {self.df['Date'].max().date()}")
-        print(f"   Countries: {self.df['Country'].nunique()}")
-        print(f"   Bacteria species: {self.df['Bacterium'].nunique()}")
-        print(f"   Antibiotics tested: {self.df['Antibiotic'].nunique()}")
-        
-        print(f"\n🦠 Resistance Overview:")
+        out = []
+        out.append("="*70)
+        out.append("📊 BASIC STATISTICS")
+        out.append("="*70)
+        
+        out.append(f"\n🔢 Dataset Overview:")
+        out.append(f"   Total samples: {len(self.df):,}")
+        out.append(f"   Date range: {self.df['Date'].min().date()} to {self.df['Date'].max().date()}")
+        out.append(f"   Countries: {self.df['Country'].nunique()}")
+        out.append(f"   Bacteria species: {self.df['Bacterium'].nunique()}")
+        out.append(f"   Antibiotics tested: {self.df['Antibiotic'].nunique()}")
+        
+        out.append(f"\n🦠 Resistance Overview:")
         resistant_count = self.df['Is_Resistant'].sum()
         resistance_rate = self.df['Is_Resistant'].mean() * 100
-        print(f"   Resistant isolates: {resistant_count:,} ({resistance_rate:.1f}%)")
-        print(f"   Susceptible isolates: {len(self.df) - resistant_count:,} ({100-resistance_rate:.1f}%)")
-        
-        print(f"\n👥 Patient Demographics:")
-        print(f"   Mean age: {self.df['Patient_Age'].mean():.1f} years (SD: {self.df['Patient_Age'].std():.1f})")
-        print(f"   Age range: {self.df['Patient_Age'].min()}-{self.df['Patient_Age'].max()} years")
-        print(f"   Mean hospital stay: {self.df['Hospital_Stay_Days'].mean():.1f} days")
-        print(f"   Mortality rate: {self.df['Patient_Died'].mean()*100:.2f}%")
-        
-        print(f"\n📈 Sample Sources:")
-        source_counts = self.df['Sample_Source'].value_counts()
-        for source, count in source_counts.items():
-            print(f"   {source}: {count:,} ({count/len(self.df)*100:.1f}%)")
+        out.append(f"   Resistant isolates: {resistant_count:,} ({resistance_rate:.1f}%)")
+        out.append(f"   Susceptible isolates: {len(self.df) - resistant_count:,} ({100-resistance_rate:.1f}%)")
+        
+        out.append(f"\n👥 Patient Demographics:")
+        out.append(f"   Mean age: {self.df['Patient_Age'].mean():.1f} years (SD: {self.df['Patient_Age'].std():.1f})")
+        out.append(f"   Age range: {self.df['Patient_Age'].min()}-{self.df['Patient_Age'].max()} years")
+        out.append(f"   Mean hospital stay: {self.df['Hospital_Stay_Days'].mean():.1f} days")
+        out.append(f"   Mortality rate: {self.df['Patient_Died'].mean()*100:.2f}%")
+        
+        out.append(f"\n📈 Sample Sources:")
+        sources = self.df['Sample_Source'].cat
+        source_counts = np.bincount(sources.codes.to_numpy(), minlength=len(sources.categories))
+        for i in np.argsort(-source_counts, kind='stable'):
+            source, count = sources.categories[i], source_counts[i]
+            if count == 0:
+                continue
+            out.append(f"   {source}: {count:,} ({count/len(self.df)*100:.1f}%)")
+        self._emit(out)
     
     def temporal_analysis(self):
         """Analyze trends over time"""
-        print("\n" + "="*70)
-        print("📅 TEMPORAL ANALYSIS")
-        print("="*70)
+        out = []
+        out.append("\n" + "="*70)
+        out.append("📅 TEMPORAL ANALYSIS")
+        out.append("="*70)
         
         # Yearly trends
-        yearly = self.df.groupby('Year').agg({
-            'Is_Resistant': 'mean',
-            'Hospital_Stay_Days': 'mean',
-            'Patient_Died': 'mean',
-            'Sample_ID': 'count'
-        }).round(3)
+        yearly = self._rollup('Year').round(3)
         
         yearly.columns = ['Resistance_Rate', 'Avg_Hospital_Days', 'Mortality_Rate', 'Sample_Count']
         yearly['Resistance_Rate'] *= 100
         yearly['Mortality_Rate'] *= 100
         
-        print("\n📊 Yearly Trends:")
-        print(yearly.to_string())
+        out.append("\n📊 Yearly Trends:")
+        out.append(yearly.to_string())
         
         # Calculate trend
-        years = yearly.index.values
-        resistance = yearly['Resistance_Rate'].values
+        years = np.asarray(self._yearly_res.index, dtype=np.float32)
+        resistance = self._yearly_res.to_numpy(np.float32)
         slope, intercept, r_value, p_value, std_err = stats.linregress(years, resistance)
         
-        print(f"\n📈 Resistance Trend Analysis:")
-        print(f"   Annual increase: {slope:+.2f}% per year")
-        print(f"   R² value: {r_value**2:.3f}")
-        print(f"   P-value: {p_value:.4f} {'(significant)' if p_value < 0.05 else '(not significant)'}")
+        out.append(f"\n📈 Resistance Trend Analysis:")
+        out.append(f"   Annual increase: {slope:+.2f}% per year")
+        out.append(f"   R² value: {r_value**2:.3f}")
+        out.append(f"   P-value: {p_value:.4f} {'(significant)' if p_value < 0.05 else '(not significant)'}")
         
+        self._emit(out)
         return yearly
     
     def geographic_analysis(self):
         """Analyze geographic patterns"""
-        print("\n" + "="*70)
-        print("🌍 GEOGRAPHIC ANALYSIS")
-        print("="*70)
+        out = []
+        out.append("\n" + "="*70)
+        out.append("🌍 GEOGRAPHIC ANALYSIS")
+        out.append("="*70)
         
-        country_stats = self.df.groupby('Country').agg({
-            'Is_Resistant': 'mean',
-            'Hospital_Stay_Days': 'mean',
-            'Patient_Died': 'mean',
-            'Sample_ID': 'count'
-        }).round(3)
+        country_stats = self._rollup('Country').round(3)
         
         country_stats.columns = ['Resistance_Rate', 'Avg_Hospital_Days', 'Mortality_Rate', 'N_Samples']
         country_stats['Resistance_Rate'] *= 100
         country_stats['Mortality_Rate'] *= 100
         country_stats = country_stats.sort_values('Resistance_Rate', ascending=False)
         
-        print("\n🗺️ Resistance by Country (sorted by resistance rate):")
-        print(country_stats.to_string())
+        out.append("\n🗺️ Resistance by Country (sorted by resistance rate):")
+        out.append(country_stats.to_string())
         
         # Statistical test: Compare high vs low resistance countries
         high_res_countries = country_stats.nlargest(3, 'Resistance_Rate').index
@@ -119,204 +199,221 @@ class AntibioticResistanceAnalyzer:
         
         t_stat, p_value = stats.ttest_ind(high_group, low_group)
         
-        print(f"\n🔬 Statistical Comparison (High vs Low resistance countries):")
-        print(f"   High resistance (top 3): {', '.join(high_res_countries)}")
-        print(f"   Low resistance (bottom 3): {', '.join(low_res_countries)}")
-        print(f"   T-statistic: {t_stat:.3f}")
-        print(f"   P-value: {p_value:.4e}")
+        out.append(f"\n🔬 Statistical Comparison (High vs Low resistance countries):")
+        out.append(f"   High resistance (top 3): {', '.join(high_res_countries)}")
+        out.append(f"   Low resistance (bottom 3): {', '.join(low_res_countries)}")
+        out.append(f"   T-statistic: {t_stat:.3f}")
+        out.append(f"   P-value: {p_value:.4e}")
         
+        self._emit(out)
         return country_stats
     
     def bacterial_analysis(self):
         """Analyze resistance by bacterial species"""
-        print("\n" + "="*70)
-        print("🦠 BACTERIAL SPECIES ANALYSIS")
-        print("="*70)
+        out = []
+        out.append("\n" + "="*70)
+        out.append("🦠 BACTERIAL SPECIES ANALYSIS")
+        out.append("="*70)
         
-        bacteria_stats = self.df.groupby('Bacterium').agg({
-            'Is_Resistant': 'mean',
-            'Hospital_Stay_Days': 'mean',
-            'Patient_Died': 'mean',
-            'Sample_ID': 'count'
-        }).round(3)
+        bacteria_stats = self._rollup('Bacterium').round(3)
         
         bacteria_stats.columns = ['Resistance_Rate', 'Avg_Hospital_Days', 'Mortality_Rate', 'N_Samples']
         bacteria_stats['Resistance_Rate'] *= 100
         bacteria_stats['Mortality_Rate'] *= 100
         bacteria_stats = bacteria_stats.sort_values('Resistance_Rate', ascending=False)
         
-        print("\n🔬 Resistance by Bacterial Species:")
-        print(bacteria_stats.to_string())
+        out.append("\n🔬 Resistance by Bacterial Species:")
+        out.append(bacteria_stats.to_string())
         
-        # Chi-square test for independence
-        contingency = pd.crosstab(self.df['Bacterium'], self.df['Is_Resistant'])
+        # Chi-square test for independence (species x resistance counts via bincount)
+        bact_codes = self.df['Bacterium'].cat.codes.to_numpy()
+        n_bact = len(self.df['Bacterium'].cat.categories)
+        resistant = self._is_resistant.astype(np.int8)
+        contingency = np.bincount(bact_codes * 2 + resistant, minlength=2 * n_bact).reshape(n_bact, 2)
+        contingency = contingency[contingency.sum(axis=1) > 0]  # drop unobserved species
         chi2, p_value, dof, expected = stats.chi2_contingency(contingency)
         
-        print(f"\n📊 Chi-Square Test (Species vs Resistance):")
-        print(f"   Chi² statistic: {chi2:.2f}")
-        print(f"   Degrees of freedom: {dof}")
-        print(f"   P-value: {p_value:.4e}")
-        print(f"   Result: Resistance {'significantly differs' if p_value < 0.05 else 'does not differ significantly'} between species")
+        out.append(f"\n📊 Chi-Square Test (Species vs Resistance):")
+        out.append(f"   Chi² statistic: {chi2:.2f}")
+        out.append(f"   Degrees of freedom: {dof}")
+        out.append(f"   P-value: {p_value:.4e}")
+        out.append(f"   Result: Resistance {'significantly differs' if p_value < 0.05 else 'does not differ significantly'} between species")
         
+        self._emit(out)
         return bacteria_stats
     
     def antibiotic_analysis(self):
         """Analyze resistance by antibiotic class"""
-        print("\n" + "="*70)
-        print("💊 ANTIBIOTIC ANALYSIS")
-        print("="*70)
+        out = []
+        out.append("\n" + "="*70)
+        out.append("💊 ANTIBIOTIC ANALYSIS")
+        out.append("="*70)
         
         # By individual antibiotic
-        ab_stats = self.df.groupby('Antibiotic').agg({
-            'Is_Resistant': 'mean',
-            'Sample_ID': 'count'
-        }).round(3)
+        ab_stats = self._rollup('Antibiotic')[['Is_Resistant', 'Sample_ID']].round(3)
         
         ab_stats.columns = ['Resistance_Rate', 'N_Tests']
         ab_stats['Resistance_Rate'] *= 100
         ab_stats = ab_stats.sort_values('Resistance_Rate', ascending=False)
         
-        print("\n💊 Resistance by Antibiotic:")
-        print(ab_stats.to_string())
+        out.append("\n💊 Resistance by Antibiotic:")
+        out.append(ab_stats.to_string())
         
         # By antibiotic class
-        class_stats = self.df.groupby('Antibiotic_Class').agg({
-            'Is_Resistant': 'mean',
-            'Sample_ID': 'count'
-        }).round(3)
+        class_stats = self._rollup('Antibiotic_Class')[['Is_Resistant', 'Sample_ID']].round(3)
         
         class_stats.columns = ['Resistance_Rate', 'N_Tests']
         class_stats['Resistance_Rate'] *= 100
         class_stats = class_stats.sort_values('Resistance_Rate', ascending=False)
         
-        print("\n📦 Resistance by Antibiotic Class:")
-        print(class_stats.to_string())
+        out.append("\n📦 Resistance by Antibiotic Class:")
+        out.append(class_stats.to_string())
         
+        self._emit(out)
         return ab_stats, class_stats
     
     def risk_factor_analysis(self):
         """Analyze risk factors for resistance"""
-        print("\n" + "="*70)
-        print("⚠️ RISK FACTOR ANALYSIS")
-        print("="*70)
+        out = []
+        out.append("\n" + "="*70)
+        out.append("⚠️ RISK FACTOR ANALYSIS")
+        out.append("="*70)
         
         # Age group analysis
-        age_resistance = self.df.groupby('Age_Group')['Is_Resistant'].agg(['mean', 'count'])
+        age_resistance = self.df.groupby('Age_Group', observed=True)['Is_Resistant'].agg(['mean', 'count'])
         age_resistance['mean'] *= 100
         age_resistance.columns = ['Resistance_Rate_%', 'N_Samples']
         
-        print("\n👥 Resistance by Age Group:")
-        print(age_resistance.to_string())
+        out.append("\n👥 Resistance by Age Group:")
+        out.append(age_resistance.to_string())
         
         # Sample source analysis
-        source_resistance = self.df.groupby('Sample_Source')['Is_Resistant'].agg(['mean', 'count'])
+        source_resistance = self.df.groupby('Sample_Source', observed=True, sort=False)['Is_Resistant'].agg(['mean', 'count'])
         source_resistance['mean'] *= 100
         source_resistance.columns = ['Resistance_Rate_%', 'N_Samples']
         source_resistance = source_resistance.sort_values('Resistance_Rate_%', ascending=False)
         
-        print("\n🩸 Resistance by Sample Source:")
-        print(source_resistance.to_string())
+        out.append("\n🩸 Resistance by Sample Source:")
+        out.append(source_resistance.to_string())
         
-        # Mortality analysis
-        resistant_mortality = self.df[self.df['Is_Resistant']==True]['Patient_Died'].mean()
-        susceptible_mortality = self.df[self.df['Is_Resistant']==False]['Patient_Died'].mean()
+        # Outcomes split by resistance status in a single pass
+        outcome_stats = self.df.groupby('Is_Resistant', sort=False).agg(
+            Mortality=('Patient_Died', 'mean'),
+            Stay=('Hospital_Stay_Days', 'mean')
+        )
+        resistant_mortality = outcome_stats.loc[True, 'Mortality']
+        susceptible_mortality = outcome_stats.loc[False, 'Mortality']
         
-        print(f"\n☠️ Mortality Comparison:")
-        print(f"   Resistant infections: {resistant_mortality*100:.2f}%")
-        print(f"   Susceptible infections: {susceptible_mortality*100:.2f}%")
-        print(f"   Relative risk: {resistant_mortality/susceptible_mortality:.2f}x higher")
+        out.append(f"\n☠️ Mortality Comparison:")
+        out.append(f"   Resistant infections: {resistant_mortality*100:.2f}%")
+        out.append(f"   Susceptible infections: {susceptible_mortality*100:.2f}%")
+        out.append(f"   Relative risk: {resistant_mortality/susceptible_mortality:.2f}x higher")
         
         # Hospital stay comparison
-        resistant_stay = self.df[self.df['Is_Resistant']==True]['Hospital_Stay_Days'].mean()
-        susceptible_stay = self.df[self.df['Is_Resistant']==False]['Hospital_Stay_Days'].mean()
+        resistant_stay = outcome_stats.loc[True, 'Stay']
+        susceptible_stay = outcome_stats.loc[False, 'Stay']
         
-        t_stat, p_value = stats.ttest_ind(
-            self.df[self.df['Is_Resistant']==True]['Hospital_Stay_Days'],
-            self.df[self.df['Is_Resistant']==False]['Hospital_Stay_Days']
-        )
+        t_stat, p_value = stats.ttest_ind(self._stay[self._is_resistant], self._stay[~self._is_resistant])
         
-        print(f"\n🏥 Hospital Stay Comparison:")
-        print(f"   Resistant infections: {resistant_stay:.1f} days (mean)")
-        print(f"   Susceptible infections: {susceptible_stay:.1f} days (mean)")
-        print(f"   Difference: {resistant_stay - susceptible_stay:.1f} days longer")
-        print(f"   T-test p-value: {p_value:.4e} (highly significant)")
+        out.append(f"\n🏥 Hospital Stay Comparison:")
+        out.append(f"   Resistant infections: {resistant_stay:.1f} days (mean)")
+        out.append(f"   Susceptible infections: {susceptible_stay:.1f} days (mean)")
+        out.append(f"   Difference: {resistant_stay - susceptible_stay:.1f} days longer")
+        out.append(f"   T-test p-value: {p_value:.4e} (highly significant)")
+        self._emit(out)
         
     def correlation_analysis(self):
         """Analyze correlations between variables"""
-        print("\n" + "="*70)
-        print("🔗 CORRELATION ANALYSIS")
-        print("="*70)
+        out = []
+        out.append("\n" + "="*70)
+        out.append("🔗 CORRELATION ANALYSIS")
+        out.append("="*70)
         
         # Select numeric columns
         numeric_cols = ['Patient_Age', 'Hospital_Stay_Days', 'Is_Resistant', 'Patient_Died']
-        corr_matrix = self.df[numeric_cols].corr()
+        mat = np.vstack([self._age, self._stay, self._is_resistant, self._died]).astype(np.float32)
+        corr_matrix = pd.DataFrame(np.corrcoef(mat), index=numeric_cols, columns=numeric_cols)
         
-        print("\n📊 Correlation Matrix:")
-        print(corr_matrix.round(3).to_string())
+        out.append("\n📊 Correlation Matrix:")
+        out.append(corr_matrix.round(3).to_string())
         
         # Notable correlations
-        print(f"\n💡 Key Findings:")
-        print(f"   • Resistance ↔ Hospital Stay: r = {corr_matrix.loc['Is_Resistant', 'Hospital_Stay_Days']:.3f}")
-        print(f"   • Resistance ↔ Mortality: r = {corr_matrix.loc['Is_Resistant', 'Patient_Died']:.3f}")
-        print(f"   • Age ↔ Mortality: r = {corr_matrix.loc['Patient_Age', 'Patient_Died']:.3f}")
+        out.append(f"\n💡 Key Findings:")
+        out.append(f"   • Resistance ↔ Hospital Stay: r = {corr_matrix.loc['Is_Resistant', 'Hospital_Stay_Days']:.3f}")
+        out.append(f"   • Resistance ↔ Mortality: r = {corr_matrix.loc['Is_Resistant', 'Patient_Died']:.3f}")
+        out.append(f"   • Age ↔ Mortality: r = {corr_matrix.loc['Patient_Age', 'Patient_Died']:.3f}")
         
+        self._emit(out)
         return corr_matrix
     
-    def advanced_insights(self):
-        """Generate advanced insights using NumPy"""
-        print("\n" + "="*70)
-        print("🧠 ADVANCED INSIGHTS")
-        print("="*70)
+    def advanced_insights(self, country_stats=None, yearly_res=None):
+        """
+        Generate advanced insights using NumPy
+        
+        Args:
+            country_stats: output of geographic_analysis() to reuse (optional)
+            yearly_res: yearly resistance rate (%) Series to reuse (optional)
+        """
+        if yearly_res is None:
+            yearly_res = self._yearly_res
+        
+        out = []
+        out.append("\n" + "="*70)
+        out.append("🧠 ADVANCED INSIGHTS")
+        out.append("="*70)
         
         # Percentile analysis
-        print("\n📈 Resistance Rate Percentiles:")
+        out.append("\n📈 Resistance Rate Percentiles:")
         percentiles = [10, 25, 50, 75, 90, 95, 99]
-        for p in percentiles:
-            val = np.percentile(self.df.groupby(['Country', 'Year'])['Is_Resistant'].mean() * 100, p)
-            print(f"   {p}th percentile: {val:.1f}%")
+        country_year_res = (self._rollup(['Country', 'Year'])['Is_Resistant'] * 100).to_numpy()
+        for p, val in zip(percentiles, np.percentile(country_year_res, percentiles)):
+            out.append(f"   {p}th percentile: {val:.1f}%")
         
         # Identify outliers (countries with extremely high resistance)
-        country_resistance = self.df.groupby('Country')['Is_Resistant'].mean() * 100
+        if country_stats is not None:
+            country_resistance = country_stats['Resistance_Rate']
+        else:
+            country_resistance = self._rollup('Country')['Is_Resistant'] * 100
         mean_res = country_resistance.mean()
         std_res = country_resistance.std()
         outliers = country_resistance[country_resistance > mean_res + 2*std_res]
         
-        print(f"\n⚠️ High-Risk Countries (>2 SD above mean):")
+        out.append(f"\n⚠️ High-Risk Countries (>2 SD above mean):")
         if len(outliers) > 0:
             for country, rate in outliers.items():
-                print(f"   {country}: {rate:.1f}% (Z-score: {(rate-mean_res)/std_res:.2f})")
+                out.append(f"   {country}: {rate:.1f}% (Z-score: {(rate-mean_res)/std_res:.2f})")
         else:
-            print("   No extreme outliers detected")
+            out.append("   No extreme outliers detected")
         
         # Year-over-year change analysis
-        print(f"\n📊 Year-over-Year Changes:")
-        yearly_res = self.df.groupby('Year')['Is_Resistant'].mean() * 100
-        for year in sorted(self.df['Year'].unique())[1:]:
-            prev_year = year - 1
-            if prev_year in yearly_res.index:
-                change = yearly_res[year] - yearly_res[prev_year]
-                print(f"   {prev_year}→{year}: {change:+.2f}%")
+        out.append(f"\n📊 Year-over-Year Changes:")
+        # Reindex over the full year span so gaps yield NaN instead of a multi-year diff
+        all_years = np.arange(yearly_res.index.min(), yearly_res.index.max() + 1)
+        yoy_changes = yearly_res.reindex(all_years).diff().dropna()
+        for year, change in yoy_changes.items():
+            out.append(f"   {year - 1}→{year}: {change:+.2f}%")
+        self._emit(out)
     
     def run_complete_analysis(self):
         """Run all analyses"""
-        print("\n" + "="*70)
-        print("🔬 ANTIBIOTIC RESISTANCE SURVEILLANCE ANALYSIS")
-        print("="*70)
-        print()
-        
-        self.basic_statistics()
-        yearly = self.temporal_analysis()
-        countries = self.geographic_analysis()
-        bacteria = self.bacterial_analysis()
-        ab_stats, class_stats = self.antibiotic_analysis()
-        self.risk_factor_analysis()
-        corr = self.correlation_analysis()
-        self.advanced_insights()
-        
-        print("\n" + "="*70)
-        print("✅ ANALYSIS COMPLETE!")
-        print("="*70)
-        print()
+        self._emit(["\n" + "="*70, "🔬 ANTIBIOTIC RESISTANCE SURVEILLANCE ANALYSIS", "="*70, ""])
+        
+        # Independent analyses are read-only over self.df: compute them in parallel,
+        # then print their reports serially in the usual order
+        methods = [self.basic_statistics, self.temporal_analysis, self.geographic_analysis,
+                   self.bacterial_analysis, self.antibiotic_analysis, self.risk_factor_analysis,
+                   self.correlation_analysis]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            outcomes = list(executor.map(self._run_captured, methods))
+        
+        for lines, _ in outcomes:
+            self._emit(lines)
+        _, yearly, countries, bacteria, (ab_stats, class_stats), _, corr = [r for _, r in outcomes]
+        
+        # Depends on the geographic results, so it runs after the parallel phase
+        self.advanced_insights(country_stats=countries, yearly_res=self._yearly_res)
+        
+        self._emit(["\n" + "="*70, "✅ ANALYSIS COMPLETE!", "="*70, ""])
         
         return {
             'yearly': yearly,
@@ -330,7 +427,7 @@ class AntibioticResistanceAnalyzer:
 
 if __name__ == '__main__':
     # Run analysis
-    analyzer = AntibioticResistanceAnalyzer('data/antibiotic_resistance_surveillance.csv')
+    analyzer = AntibioticResistanceAnalyzer('data/antibiotic_resistance_surveillance.parquet')
     results = analyzer.run_complete_analysis()
     
     print("💾 Analysis results saved to memory")
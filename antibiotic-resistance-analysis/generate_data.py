@@ -5,13 +5,11 @@ Simulates realistic patterns of antimicrobial resistance across countries and ti
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 
-np.random.seed(42)
 
-
-def generate_resistance_data(n_records=10000):
+def generate_resistance_data(n_records=10000, seed=42):
     """Generate comprehensive antibiotic resistance surveillance dataset"""
+    rng = np.random.default_rng(seed)
     
     countries = ['USA', 'UK', 'Germany', 'France', 'Japan', 'India', 'Brazil', 
                  'South Africa', 'Australia', 'Canada', 'China', 'Mexico']
@@ -73,82 +71,93 @@ def generate_resistance_data(n_records=10000):
         'Canada': 0.90, 'China': 1.30, 'Mexico': 1.25
     }
     
-    data = []
-    start_date = datetime(2015, 1, 1)
-    
-    for i in range(n_records):
-        # Selections
-        country = np.random.choice(countries)
-        bacterium = np.random.choice(list(bacteria_species.keys()))
-        
-        # Get applicable antibiotics for this bacterium
-        applicable_abs = list(base_resistance[bacterium].keys())
-        antibiotic = np.random.choice(applicable_abs)
-        
-        # Date and year
-        days_offset = np.random.randint(0, 365 * 10)
-        sample_date = start_date + timedelta(days=days_offset)
-        year = sample_date.year
-        
-        # Calculate resistance probability
-        base_rate = base_resistance[bacterium][antibiotic]
-        country_mod = country_factors[country]
-        year_trend = (year - 2015) * 1.8  # Increasing trend over years
-        
-        # Source-specific modifiers (blood infections often more resistant)
-        sample_source = np.random.choice(sample_sources)
-        source_mod = 1.15 if sample_source == 'Blood' else 1.0
-        
-        resistance_rate = base_rate * country_mod * source_mod + year_trend
-        resistance_rate += np.random.normal(0, 8)  # Add noise
-        resistance_rate = np.clip(resistance_rate, 0, 99)
-        
-        # Determine resistance
-        is_resistant = np.random.random() < (resistance_rate / 100)
-        
-        # Patient demographics
-        patient_age = int(np.abs(np.random.normal(55, 25)))
-        patient_age = np.clip(patient_age, 0, 100)
-        
-        # Hospital outcomes
-        if is_resistant:
-            hospital_days = int(np.random.exponential(10) + 5)
-            mortality = np.random.random() < 0.15
-        else:
-            hospital_days = int(np.random.exponential(6) + 2)
-            mortality = np.random.random() < 0.05
-        
-        hospital_days = min(hospital_days, 90)
-        
-        # Bacterial characteristics
-        gram_stain, morphology = bacteria_species[bacterium]
-        antibiotic_class = antibiotics[antibiotic]
-        
-        data.append({
-            'Sample_ID': f'AMR{i+1:06d}',
-            'Country': country,
-            'Date': sample_date.strftime('%Y-%m-%d'),
-            'Year': year,
-            'Quarter': f'Q{(sample_date.month-1)//3 + 1}',
-            'Bacterium': bacterium,
-            'Gram_Stain': gram_stain,
-            'Morphology': morphology,
-            'Antibiotic': antibiotic,
-            'Antibiotic_Class': antibiotic_class,
-            'Sample_Source': sample_source,
-            'Is_Resistant': is_resistant,
-            'Resistance_Rate_Percent': round(resistance_rate, 2),
-            'Patient_Age': patient_age,
-            'Hospital_Stay_Days': hospital_days,
-            'Patient_Died': mortality
-        })
-    
-    df = pd.DataFrame(data)
+    # Integer lookup tables so every record can be sampled in one vectorized pass
+    bacteria_names = list(bacteria_species.keys())
+    antibiotic_names = list(antibiotics.keys())
+    ab_index = {ab: j for j, ab in enumerate(antibiotic_names)}
+    
+    country_factor_arr = np.array([country_factors[c] for c in countries])
+    gram_arr = np.array([bacteria_species[b][0] for b in bacteria_names])
+    morphology_arr = np.array([bacteria_species[b][1] for b in bacteria_names])
+    class_arr = np.array([antibiotics[ab] for ab in antibiotic_names])
+    
+    # Base resistance matrix (bacterium x antibiotic), NaN where not applicable
+    base_rate_matrix = np.full((len(bacteria_names), len(antibiotic_names)), np.nan)
+    for b, bacterium in enumerate(bacteria_names):
+        for ab, rate in base_resistance[bacterium].items():
+            base_rate_matrix[b, ab_index[ab]] = rate
+    
+    # CSR-style table of applicable antibiotics per bacterium
+    applicable_counts = np.array([len(base_resistance[b]) for b in bacteria_names])
+    applicable_offsets = np.concatenate(([0], np.cumsum(applicable_counts)[:-1]))
+    applicable_abs = np.array([ab_index[ab] for b in bacteria_names for ab in base_resistance[b]])
+    
+    # Selections
+    country_idx = rng.integers(0, len(countries), n_records)
+    bact_idx = rng.integers(0, len(bacteria_names), n_records)
+    ab_local = rng.integers(0, applicable_counts[bact_idx])
+    ab_idx = applicable_abs[applicable_offsets[bact_idx] + ab_local]
+    
+    # Date and year
+    days_offset = rng.integers(0, 365 * 10, n_records)
+    sample_dates = np.datetime64('2015-01-01') + days_offset.astype('timedelta64[D]')
+    years = sample_dates.astype('datetime64[Y]').astype(int) + 1970
+    months = sample_dates.astype('datetime64[M]').astype(int) % 12 + 1
+    
+    # Source-specific modifiers (blood infections often more resistant)
+    source_idx = rng.integers(0, len(sample_sources), n_records)
+    source_mod = np.where(source_idx == sample_sources.index('Blood'), 1.15, 1.0)
+    
+    # Calculate resistance probability
+    year_trend = (years - 2015) * 1.8  # Increasing trend over years
+    resistance_rate = (base_rate_matrix[bact_idx, ab_idx] * country_factor_arr[country_idx] * source_mod
+                       + year_trend)
+    resistance_rate += rng.standard_normal(n_records) * 8  # Add noise
+    resistance_rate = np.clip(resistance_rate, 0, 99)
+    
+    # Determine resistance
+    is_resistant = rng.random(n_records) < (resistance_rate / 100)
+    
+    # Patient demographics
+    patient_age = np.abs(rng.normal(55, 25, n_records)).astype(int)
+    patient_age = np.clip(patient_age, 0, 100)
+    
+    # Hospital outcomes
+    hospital_days = (rng.exponential(np.where(is_resistant, 10, 6))
+                     + np.where(is_resistant, 5, 2)).astype(int)
+    hospital_days = np.minimum(hospital_days, 90)
+    mortality = rng.random(n_records) < np.where(is_resistant, 0.15, 0.05)
+    
+    df = pd.DataFrame({
+        'Sample_ID': np.char.add('AMR', np.char.zfill(np.arange(1, n_records + 1).astype(str), 6)),
+        'Country': np.array(countries)[country_idx],
+        'Date': sample_dates,
+        'Year': years.astype(np.uint16),
+        'Quarter': np.array(['Q1', 'Q2', 'Q3', 'Q4'])[(months - 1) // 3],
+        'Bacterium': np.array(bacteria_names)[bact_idx],
+        'Gram_Stain': gram_arr[bact_idx],
+        'Morphology': morphology_arr[bact_idx],
+        'Antibiotic': np.array(antibiotic_names)[ab_idx],
+        'Antibiotic_Class': class_arr[ab_idx],
+        'Sample_Source': np.array(sample_sources)[source_idx],
+        'Is_Resistant': is_resistant,
+        'Resistance_Rate_Percent': np.round(resistance_rate, 2),
+        'Patient_Age': patient_age.astype(np.uint8),
+        'Hospital_Stay_Days': hospital_days.astype(np.uint8),
+        'Patient_Died': mortality
+    })
     
     # Add some derived features
-    df['Age_Group'] = pd.cut(df['Patient_Age'], 
-                               bins=[0, 18, 45, 65, 100], 
-                               labels=['Pediatric', 'Young Adult', 'Middle Age', 'Elderly'])
+    # Age bands (0-18], (18-45], (45-65], (65-100]; newborns (age 0) count as Pediatric
+    age_edges = np.array([18, 45, 65])
+    df['Age_Group'] = pd.Categorical.from_codes(
+        np.searchsorted(age_edges, patient_age, side='left'),
+        categories=['Pediatric', 'Young Adult', 'Middle Age', 'Elderly'], ordered=True)
+    
+    # Typed columns keep the Parquet file small and skip dtype inference on load
+    for col in ['Country', 'Quarter', 'Bacterium', 'Gram_Stain', 'Morphology',
+                'Antibiotic', 'Antibiotic_Class', 'Sample_Source']:
+        df[col] = df[col].astype('category')
     
     return df
 
@@ -169,8 +178,8 @@ if __name__ == '__main__':
     df = generate_resistance_data(10000)
     
     # Save
-    output_file = 'data/antibiotic_resistance_surveillance.csv'
-    df.to_csv(output_file, index=False)
+    output_file = 'data/antibiotic_resistance_surveillance.parquet'
+    df.to_parquet(output_file, compression='zstd', index=False)
     
     print(f"✅ Generated {len(df):,} records")
     print(f"💾 Saved to: {output_file}")
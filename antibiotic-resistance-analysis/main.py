@@ -32,7 +32,11 @@ print("\n" + "="*70)
 print("📈 STEP 2: STATISTICAL ANALYSIS")
 print("-"*70)
 try:
-    import analyze
+    import pandas as pd
+    from analyze import AntibioticResistanceAnalyzer
+    # Read once; the analyzer and the visualizer share this frame
+    df = pd.read_parquet('data/antibiotic_resistance_surveillance.parquet')
+    AntibioticResistanceAnalyzer(data=df).run_complete_analysis()
     print()
 except Exception as e:
     print(f"❌ Error in analysis: {e}")
@@ -43,7 +47,8 @@ print("\n" + "="*70)
 print("🎨 STEP 3: GENERATING VISUALIZATIONS")
 print("-"*70)
 try:
-    import visualize
+    from visualize import ResistanceVisualizer
+    ResistanceVisualizer(data=df).create_all_visualizations()
     print()
 except Exception as e:
     print(f"❌ Error in visualization: {e}")
@@ -55,7 +60,7 @@ print("✅ PIPELINE COMPLETE!")
 print("="*70)
 print()
 print("📁 Generated Files:")
-print("   • data/antibiotic_resistance_surveillance.csv")
+print("   • data/antibiotic_resistance_surveillance.parquet")
 print("   • outputs/temporal_trends.png")
 print("   • outputs/geographic_heatmap.png")
 print("   • outputs/bacterial_analysis.png")
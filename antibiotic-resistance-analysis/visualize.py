@@ -3,36 +3,178 @@
 Create beautiful and insightful charts for antibiotic resistance data
 """
 
+import os
+import sys
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.gridspec import GridSpec
 import warnings
 warnings.filterwarnings('ignore')
 
-# Enhanced plotting style
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_context("notebook", font_scale=1.1)
-sns.set_palette("husl")
+# matplotlib/seaborn are imported on first use (see _setup_mpl) so importing this module stays cheap
+plt = None
+sns = None
+GridSpec = None
+
+# Grouping keys cast to categoricals so groupby reuses the existing factorization
+CATEGORY_COLUMNS = ['Bacterium', 'Country', 'Antibiotic', 'Antibiotic_Class', 'Sample_Source', 'Quarter']
+
+# Output resolution for saved figures (override with VIZ_DPI)
+DPI = int(os.getenv('VIZ_DPI', '150'))
+
+# Fast zlib level for PNG output; files are marginally larger but encode much quicker
+PNG_OPTIONS = {'compress_level': 1, 'optimize': False}
+
+# Independent figure renderers, run in parallel by create_all_visualizations
+PLOT_METHODS = ['plot_temporal_trends', 'plot_geographic_heatmap', 'plot_bacterial_analysis',
+                'plot_antibiotic_analysis', 'plot_clinical_outcomes', 'plot_correlation_matrix']
+
+# Grouped tables the plots read, as (keys, column, reduction); built once in __init__ so forked
+# workers inherit them instead of each recomputing its own
+PLOT_AGGREGATIONS = [
+    (('Year',), 'Is_Resistant', 'mean'),
+    (('Year',), 'Is_Resistant', 'size'),
+    (('Year', 'Quarter'), 'Is_Resistant', 'mean'),
+    (('Bacterium',), 'Is_Resistant', 'mean'),
+    (('Bacterium',), 'Patient_Died', 'mean'),
+    (('Bacterium', 'Year'), 'Is_Resistant', 'mean'),
+    (('Country',), 'Is_Resistant', 'mean'),
+    (('Country', 'Year'), 'Is_Resistant', 'mean'),
+    (('Antibiotic',), 'Is_Resistant', 'mean'),
+    (('Antibiotic', 'Year'), 'Is_Resistant', 'mean'),
+    (('Antibiotic_Class',), 'Is_Resistant', 'mean'),
+    (('Is_Resistant',), 'Hospital_Stay_Days', 'mean'),
+    (('Is_Resistant',), 'Patient_Died', 'mean'),
+    (('Sample_Source',), 'Is_Resistant', 'mean'),
+    (('Sample_Source',), 'Patient_Died', 'mean'),
+]
+
+# Heatmaps larger than this are drawn without per-cell text annotations
+MAX_ANNOTATED_CELLS = 200
+
+
+# Visualizer inherited by forked worker processes (set only while a pool is running)
+_shared_visualizer = None
+
+
+def _setup_mpl():
+    """Import matplotlib/seaborn and apply the plotting style, once per process"""
+    global plt, sns, GridSpec
+    if plt is not None:
+        return
+    import matplotlib
+    matplotlib.use('Agg')  # figures are only written to files; skip GUI backend setup
+    import matplotlib.pyplot as pyplot
+    import seaborn
+    from matplotlib.gridspec import GridSpec as grid_spec
+    
+    # Enhanced plotting style
+    pyplot.style.use('seaborn-v0_8-whitegrid')
+    seaborn.set_context("notebook", font_scale=1.1)
+    seaborn.set_palette("husl")
+    plt, sns, GridSpec = pyplot, seaborn, grid_spec
+
+
+def _render_plot(method_name):
+    """Worker entry point: render one figure from the visualizer inherited via fork"""
+    getattr(_shared_visualizer, method_name)()
 
 
 class ResistanceVisualizer:
     """Create comprehensive visualizations"""
     
-    def __init__(self, data_path):
-        """Load data"""
-        self.df = pd.read_csv(data_path)
-        self.df['Date'] = pd.to_datetime(self.df['Date'])
+    def __init__(self, data_path=None, data=None):
+        """Load data from data_path, or share an already-loaded DataFrame via data"""
+        _setup_mpl()
+        if data is not None:
+            self.df = data.copy(deep=False)  # shallow: the caller's frame is left untouched
+        elif data_path:
+            self.df = pd.read_parquet(data_path)
+        else:
+            raise ValueError("Provide either data_path or data")
+        for col in CATEGORY_COLUMNS:
+            self.df[col] = self.df[col].astype('category')
+        self._agg = {}  # memoized groupby results, filled up front so the fork pool shares them
+        for keys, col, how in PLOT_AGGREGATIONS:
+            self._cached_groupby(keys, col, how)
+        
+        # Content signature of the data; figures rendered from identical data are reused
+        row_hashes = pd.util.hash_pandas_object(self.df, index=False).values
+        digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+        digest.update(f'dpi={DPI}'.encode())  # a DPI change invalidates cached figures
+        self._sig = digest.hexdigest()
         print(f"📊 Visualizer initialized with {len(self.df):,} records")
+    
+    def _cached_groupby(self, keys, col, how):
+        """Return self.df.groupby(keys)[col].agg(how), computing it only once"""
+        cache_key = (tuple(keys), col, how)
+        if cache_key not in self._agg:
+            self._agg[cache_key] = self.df.groupby(list(keys), observed=True)[col].agg(how)
+        return self._agg[cache_key]
+    
+    @staticmethod
+    def _prepare_heatmap(pivot):
+        """Trim empty rows/columns and cast to float32 for heatmap rendering"""
+        pivot = pivot.dropna(how='all').dropna(axis=1, how='all').astype(np.float32)
+        return pivot, pivot.size <= MAX_ANNOTATED_CELLS
+    
+    @staticmethod
+    def _draw_heatmap(ax, pivot, fmt, annotate, cbar_label, cmap='RdYlGn_r'):
+        """Draw pivot as an imshow heatmap with optional cell labels (lighter than sns.heatmap)"""
+        values = pivot.to_numpy()
+        im = ax.imshow(values, cmap=cmap, aspect='auto', interpolation='nearest')
+        
+        ax.set_xticks(np.arange(values.shape[1]), labels=pivot.columns, rotation=90)
+        ax.set_yticks(np.arange(values.shape[0]), labels=pivot.index)
+        ax.set_xticks(np.arange(values.shape[1] + 1) - 0.5, minor=True)
+        ax.set_yticks(np.arange(values.shape[0] + 1) - 0.5, minor=True)
+        ax.grid(False)
+        ax.grid(which='minor', color='gray', linewidth=0.5)
+        ax.tick_params(which='minor', length=0)
+        
+        if annotate:
+            # Dark text on light cells and vice versa, decided for all cells at once
+            rgba = im.cmap(im.norm(values))
+            luminance = rgba[..., :3] @ np.array([0.2126, 0.7152, 0.0722])
+            for (i, j), v in np.ndenumerate(values):
+                if not np.isnan(v):
+                    ax.text(j, i, format(v, fmt), ha='center', va='center',
+                            color='black' if luminance[i, j] > 0.408 else 'white')
+        
+        plt.colorbar(im, ax=ax, label=cbar_label)
+    
+    def _is_cached(self, save_path):
+        """True if save_path was already rendered from identical data"""
+        sig_path = save_path + '.sig'
+        if not (os.path.exists(save_path) and os.path.exists(sig_path)):
+            return False
+        with open(sig_path) as f:
+            if f.read().strip() != self._sig:
+                return False
+        print(f"⏭️ Up to date: {save_path}")
+        return True
+    
+    def _save_figure(self, save_path):
+        """Save the current figure and record the data signature next to it"""
+        plt.tight_layout()
+        plt.savefig(save_path, dpi=DPI, bbox_inches='tight', pil_kwargs=PNG_OPTIONS)
+        with open(save_path + '.sig', 'w') as f:
+            f.write(self._sig)
+        print(f"✅ Saved: {save_path}")
+        plt.close()
         
     def plot_temporal_trends(self, save_path='outputs/temporal_trends.png'):
         """Plot resistance trends over time"""
+        if self._is_cached(save_path):
+            return
+        
         fig, axes = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle('🕐 Temporal Trends in Antibiotic Resistance', fontsize=18, fontweight='bold')
         
         # 1. Overall resistance by year
-        yearly = self.df.groupby('Year')['Is_Resistant'].mean() * 100
+        yearly = self._cached_groupby(('Year',), 'Is_Resistant', 'mean') * 100
         axes[0, 0].plot(yearly.index, yearly.values, marker='o', linewidth=3, markersize=10, color='#e74c3c')
         axes[0, 0].fill_between(yearly.index, yearly.values, alpha=0.3, color='#e74c3c')
         axes[0, 0].set_title('Overall Resistance Rate Over Time', fontweight='bold', fontsize=14)
@@ -47,9 +189,9 @@ class ResistanceVisualizer:
         axes[0, 0].legend()
         
         # 2. Resistance by bacterial species over time
-        for bacterium in self.df['Bacterium'].unique():
-            subset = self.df[self.df['Bacterium'] == bacterium]
-            yearly_bac = subset.groupby('Year')['Is_Resistant'].mean() * 100
+        bac_year = self._cached_groupby(('Bacterium', 'Year'), 'Is_Resistant', 'mean').unstack('Year') * 100
+        for bacterium, yearly_bac in bac_year.iterrows():
+            yearly_bac = yearly_bac.dropna()
             axes[0, 1].plot(yearly_bac.index, yearly_bac.values, marker='o', label=bacterium.split()[0], linewidth=2)
         
         axes[0, 1].set_title('Resistance Trends by Bacterial Species', fontweight='bold', fontsize=14)
@@ -59,37 +201,37 @@ class ResistanceVisualizer:
         axes[0, 1].grid(True, alpha=0.3)
         
         # 3. Quarterly trends (recent years)
-        recent = self.df[self.df['Year'] >= 2020].copy()
-        recent['YearQuarter'] = recent['Year'].astype(str) + '-' + recent['Quarter']
-        quarterly = recent.groupby('YearQuarter')['Is_Resistant'].mean() * 100
+        quarterly = self._cached_groupby(('Year', 'Quarter'), 'Is_Resistant', 'mean')
+        quarterly = quarterly[quarterly.index.get_level_values('Year') >= 2020] * 100
+        quarter_labels = [f'{year}-{quarter}' for year, quarter in quarterly.index]
         
         axes[1, 0].bar(range(len(quarterly)), quarterly.values, color='#3498db', alpha=0.7)
         axes[1, 0].set_xticks(range(len(quarterly)))
-        axes[1, 0].set_xticklabels(quarterly.index, rotation=45, ha='right', fontsize=9)
+        axes[1, 0].set_xticklabels(quarter_labels, rotation=45, ha='right', fontsize=9)
         axes[1, 0].set_title('Quarterly Resistance Rates (2020-2024)', fontweight='bold', fontsize=14)
         axes[1, 0].set_ylabel('Resistance Rate (%)', fontsize=12)
         axes[1, 0].grid(True, axis='y', alpha=0.3)
         
         # 4. Sample volume over time
-        samples_per_year = self.df.groupby('Year').size()
+        samples_per_year = self._cached_groupby(('Year',), 'Is_Resistant', 'size')
         axes[1, 1].bar(samples_per_year.index, samples_per_year.values, color='#2ecc71', alpha=0.7)
         axes[1, 1].set_title('Sample Volume by Year', fontweight='bold', fontsize=14)
         axes[1, 1].set_xlabel('Year', fontsize=12)
         axes[1, 1].set_ylabel('Number of Samples', fontsize=12)
         axes[1, 1].grid(True, axis='y', alpha=0.3)
         
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"✅ Saved: {save_path}")
-        plt.close()
+        self._save_figure(save_path)
         
     def plot_geographic_heatmap(self, save_path='outputs/geographic_heatmap.png'):
         """Create geographic resistance heatmap"""
+        if self._is_cached(save_path):
+            return
+        
         fig, axes = plt.subplots(1, 2, figsize=(18, 6))
         fig.suptitle('🌍 Geographic Distribution of Antibiotic Resistance', fontsize=18, fontweight='bold')
         
         # 1. Resistance rate by country
-        country_res = self.df.groupby('Country')['Is_Resistant'].mean() * 100
+        country_res = self._cached_groupby(('Country',), 'Is_Resistant', 'mean') * 100
         country_res = country_res.sort_values(ascending=True)
         
         colors = plt.cm.RdYlGn_r(np.linspace(0.2, 0.8, len(country_res)))
@@ -101,29 +243,28 @@ class ResistanceVisualizer:
         axes[0].grid(True, axis='x', alpha=0.3)
         
         # 2. Heatmap: Country x Year
-        pivot_data = self.df.groupby(['Country', 'Year'])['Is_Resistant'].mean().unstack() * 100
+        pivot_data = self._cached_groupby(('Country', 'Year'), 'Is_Resistant', 'mean').unstack() * 100
+        pivot_data, annotate = self._prepare_heatmap(pivot_data)
         
-        sns.heatmap(pivot_data, annot=True, fmt='.1f', cmap='RdYlGn_r', 
-                    cbar_kws={'label': 'Resistance Rate (%)'}, ax=axes[1],
-                    linewidths=0.5, linecolor='gray')
+        self._draw_heatmap(axes[1], pivot_data, '.1f', annotate, 'Resistance Rate (%)')
         axes[1].set_title('Resistance Rate: Country × Year', fontweight='bold', fontsize=14)
         axes[1].set_xlabel('Year', fontsize=12)
         axes[1].set_ylabel('Country', fontsize=12)
         
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"✅ Saved: {save_path}")
-        plt.close()
+        self._save_figure(save_path)
         
     def plot_bacterial_analysis(self, save_path='outputs/bacterial_analysis.png'):
         """Visualize bacterial species patterns"""
+        if self._is_cached(save_path):
+            return
+        
         fig = plt.figure(figsize=(18, 10))
         gs = GridSpec(2, 3, figure=fig)
         fig.suptitle('🦠 Bacterial Species Analysis', fontsize=18, fontweight='bold')
         
         # 1. Resistance by species
         ax1 = fig.add_subplot(gs[0, 0])
-        species_res = self.df.groupby('Bacterium')['Is_Resistant'].mean() * 100
+        species_res = self._cached_groupby(('Bacterium',), 'Is_Resistant', 'mean') * 100
         species_res = species_res.sort_values(ascending=True)
         ax1.barh(species_res.index, species_res.values, color='#e74c3c', alpha=0.7)
         ax1.set_xlabel('Resistance Rate (%)')
@@ -138,7 +279,7 @@ class ResistanceVisualizer:
         
         # 3. Mortality by species
         ax3 = fig.add_subplot(gs[0, 2])
-        species_mort = self.df.groupby('Bacterium')['Patient_Died'].mean() * 100
+        species_mort = self._cached_groupby(('Bacterium',), 'Patient_Died', 'mean') * 100
         species_mort = species_mort.sort_values(ascending=False)
         ax3.bar(range(len(species_mort)), species_mort.values, color='#9b59b6', alpha=0.7)
         ax3.set_xticks(range(len(species_mort)))
@@ -149,12 +290,16 @@ class ResistanceVisualizer:
         
         # 4. Hospital stay comparison
         ax4 = fig.add_subplot(gs[1, :])
+        grouped = self.df.groupby(['Bacterium', 'Is_Resistant'], observed=True, sort=False)['Hospital_Stay_Days']
+        stays = {key: group.to_numpy() for key, group in grouped}
+        empty = np.array([], dtype=self.df['Hospital_Stay_Days'].dtype)
+        
         species_stay = []
         species_names = []
-        for species in self.df['Bacterium'].unique():
-            resistant = self.df[(self.df['Bacterium']==species) & (self.df['Is_Resistant']==True)]['Hospital_Stay_Days']
-            susceptible = self.df[(self.df['Bacterium']==species) & (self.df['Is_Resistant']==False)]['Hospital_Stay_Days']
-            species_stay.append([susceptible.values, resistant.values])
+        for species in self.df['Bacterium'].cat.categories:
+            if (species, False) not in stays and (species, True) not in stays:
+                continue
+            species_stay.append([stays.get((species, False), empty), stays.get((species, True), empty)])
             species_names.append(species.split()[0])
         
         positions = np.arange(len(species_names)) * 3
@@ -172,18 +317,18 @@ class ResistanceVisualizer:
         ax4.legend([bp1["boxes"][0], bp2["boxes"][0]], ['Susceptible', 'Resistant'], loc='upper right')
         ax4.grid(True, axis='y', alpha=0.3)
         
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"✅ Saved: {save_path}")
-        plt.close()
+        self._save_figure(save_path)
         
     def plot_antibiotic_analysis(self, save_path='outputs/antibiotic_analysis.png'):
         """Visualize antibiotic effectiveness"""
+        if self._is_cached(save_path):
+            return
+        
         fig, axes = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle('💊 Antibiotic Effectiveness Analysis', fontsize=18, fontweight='bold')
         
         # 1. Resistance by antibiotic
-        ab_res = self.df.groupby('Antibiotic')['Is_Resistant'].mean() * 100
+        ab_res = self._cached_groupby(('Antibiotic',), 'Is_Resistant', 'mean') * 100
         ab_res = ab_res.sort_values(ascending=False)
         
         colors_ab = ['#e74c3c' if x > 50 else '#f39c12' if x > 30 else '#2ecc71' for x in ab_res.values]
@@ -197,7 +342,7 @@ class ResistanceVisualizer:
         axes[0, 0].grid(True, axis='y', alpha=0.3)
         
         # 2. Resistance by antibiotic class
-        class_res = self.df.groupby('Antibiotic_Class')['Is_Resistant'].mean() * 100
+        class_res = self._cached_groupby(('Antibiotic_Class',), 'Is_Resistant', 'mean') * 100
         class_res = class_res.sort_values(ascending=True)
         
         axes[0, 1].barh(class_res.index, class_res.values, color='#3498db', alpha=0.7)
@@ -206,27 +351,29 @@ class ResistanceVisualizer:
         axes[0, 1].grid(True, axis='x', alpha=0.3)
         
         # 3. Heatmap: Bacterium x Antibiotic
-        # Get top combinations
-        combo_data = self.df.groupby(['Bacterium', 'Antibiotic']).agg({
-            'Is_Resistant': 'mean',
-            'Sample_ID': 'count'
-        })
-        combo_data = combo_data[combo_data['Sample_ID'] >= 50]  # Filter for sufficient samples
-        pivot = combo_data['Is_Resistant'].unstack() * 100
-        
-        sns.heatmap(pivot, annot=True, fmt='.0f', cmap='RdYlGn_r', 
-                    cbar_kws={'label': 'Resistance Rate (%)'}, ax=axes[1, 0],
-                    linewidths=0.5, linecolor='gray')
+        # Counts and resistant sums per cell via bincount on the categorical codes
+        bact, abx = self.df['Bacterium'].cat, self.df['Antibiotic'].cat
+        n_bact, n_abx = len(bact.categories), len(abx.categories)
+        cell = bact.codes.to_numpy().astype(np.intp) * n_abx + abx.codes.to_numpy()
+        counts = np.bincount(cell, minlength=n_bact * n_abx).reshape(n_bact, n_abx)
+        resistant = np.bincount(cell, weights=self.df['Is_Resistant'].to_numpy(),
+                                minlength=n_bact * n_abx).reshape(n_bact, n_abx)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rates = np.where(counts >= 50, resistant / counts * 100, np.nan)  # Filter for sufficient samples
+        pivot, annotate = self._prepare_heatmap(
+            pd.DataFrame(rates, index=bact.categories, columns=abx.categories))
+        
+        self._draw_heatmap(axes[1, 0], pivot, '.0f', annotate, 'Resistance Rate (%)')
         axes[1, 0].set_title('Resistance Matrix: Bacterium × Antibiotic', fontweight='bold')
         axes[1, 0].set_xlabel('Antibiotic')
         axes[1, 0].set_ylabel('Bacterium')
         
         # 4. Temporal trends for critical antibiotics
         critical_abs = ['Meropenem', 'Vancomycin', 'Colistin']
+        ab_year = self._cached_groupby(('Antibiotic', 'Year'), 'Is_Resistant', 'mean').unstack('Year') * 100
         for ab in critical_abs:
-            if ab in self.df['Antibiotic'].values:
-                subset = self.df[self.df['Antibiotic'] == ab]
-                yearly = subset.groupby('Year')['Is_Resistant'].mean() * 100
+            if ab in ab_year.index:
+                yearly = ab_year.loc[ab].dropna()
                 axes[1, 1].plot(yearly.index, yearly.values, marker='o', label=ab, linewidth=2, markersize=8)
         
         axes[1, 1].set_xlabel('Year')
@@ -235,32 +382,35 @@ class ResistanceVisualizer:
         axes[1, 1].legend()
         axes[1, 1].grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"✅ Saved: {save_path}")
-        plt.close()
+        self._save_figure(save_path)
         
     def plot_clinical_outcomes(self, save_path='outputs/clinical_outcomes.png'):
         """Visualize clinical outcomes"""
+        if self._is_cached(save_path):
+            return
+        
         fig, axes = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle('🏥 Clinical Outcomes Analysis', fontsize=18, fontweight='bold')
         
         # 1. Hospital stay: Resistant vs Susceptible
-        resistant_stay = self.df[self.df['Is_Resistant']==True]['Hospital_Stay_Days']
-        susceptible_stay = self.df[self.df['Is_Resistant']==False]['Hospital_Stay_Days']
-        
-        axes[0, 0].hist([susceptible_stay, resistant_stay], bins=30, label=['Susceptible', 'Resistant'],
-                       color=['#2ecc71', '#e74c3c'], alpha=0.6)
+        # Bin counts computed in NumPy; each series is drawn as a single stairs artist
+        stay = self.df['Hospital_Stay_Days'].to_numpy()
+        is_resistant = self.df['Is_Resistant'].to_numpy()
+        edges = np.linspace(stay.min(), stay.max(), 31)
+        mean_stay = self._cached_groupby(('Is_Resistant',), 'Hospital_Stay_Days', 'mean')
+        
+        for status, label, color in [(False, 'Susceptible', '#2ecc71'), (True, 'Resistant', '#e74c3c')]:
+            counts, _ = np.histogram(stay[is_resistant == status], edges)
+            axes[0, 0].stairs(counts, edges, fill=True, alpha=0.6, color=color, label=label)
+            axes[0, 0].axvline(mean_stay[status], color=color, linestyle='--', linewidth=2)
         axes[0, 0].set_xlabel('Hospital Stay (days)')
         axes[0, 0].set_ylabel('Frequency')
         axes[0, 0].set_title('Hospital Stay Distribution', fontweight='bold')
         axes[0, 0].legend()
-        axes[0, 0].axvline(susceptible_stay.mean(), color='#2ecc71', linestyle='--', linewidth=2)
-        axes[0, 0].axvline(resistant_stay.mean(), color='#e74c3c', linestyle='--', linewidth=2)
         axes[0, 0].grid(True, alpha=0.3)
         
         # 2. Mortality by resistance status
-        mort_data = self.df.groupby('Is_Resistant')['Patient_Died'].mean() * 100
+        mort_data = self._cached_groupby(('Is_Resistant',), 'Patient_Died', 'mean') * 100
         axes[0, 1].bar(['Susceptible', 'Resistant'], mort_data.values, 
                       color=['#2ecc71', '#e74c3c'], alpha=0.7, width=0.6)
         axes[0, 1].set_ylabel('Mortality Rate (%)')
@@ -275,21 +425,19 @@ class ResistanceVisualizer:
         age_bins = [0, 18, 45, 65, 100]
         age_labels = ['<18', '18-45', '45-65', '65+']
         
-        age_res = []
-        for i in range(len(age_bins)-1):
-            mask = (self.df['Patient_Age'] >= age_bins[i]) & (self.df['Patient_Age'] < age_bins[i+1])
-            age_res.append(self.df[mask]['Is_Resistant'].mean() * 100)
+        ages = pd.cut(self.df['Patient_Age'], bins=age_bins, labels=age_labels, right=False)
+        age_res = self.df.groupby(ages, observed=True)['Is_Resistant'].mean() * 100
         
-        axes[1, 0].bar(age_labels, age_res, color='#9b59b6', alpha=0.7)
+        axes[1, 0].bar(age_res.index.astype(str), age_res.values, color='#9b59b6', alpha=0.7)
         axes[1, 0].set_xlabel('Age Group')
         axes[1, 0].set_ylabel('Resistance Rate (%)')
         axes[1, 0].set_title('Resistance by Age Group', fontweight='bold')
         axes[1, 0].grid(True, axis='y', alpha=0.3)
         
         # 4. Sample source analysis
-        source_data = self.df.groupby('Sample_Source').agg({
-            'Is_Resistant': 'mean',
-            'Patient_Died': 'mean'
+        source_data = pd.DataFrame({
+            'Is_Resistant': self._cached_groupby(('Sample_Source',), 'Is_Resistant', 'mean'),
+            'Patient_Died': self._cached_groupby(('Sample_Source',), 'Patient_Died', 'mean')
         }) * 100
         
         x = np.arange(len(source_data))
@@ -307,18 +455,19 @@ class ResistanceVisualizer:
         axes[1, 1].legend()
         axes[1, 1].grid(True, axis='y', alpha=0.3)
         
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"✅ Saved: {save_path}")
-        plt.close()
+        self._save_figure(save_path)
         
     def plot_correlation_matrix(self, save_path='outputs/correlation_matrix.png'):
         """Create correlation heatmap"""
+        if self._is_cached(save_path):
+            return
+        
         fig, ax = plt.subplots(figsize=(10, 8))
         
         # Select numeric variables
         numeric_cols = ['Patient_Age', 'Hospital_Stay_Days', 'Is_Resistant', 'Patient_Died']
-        corr_matrix = self.df[numeric_cols].corr()
+        mat = np.ascontiguousarray(self.df[numeric_cols].to_numpy(dtype=np.float32).T)
+        corr_matrix = pd.DataFrame(np.corrcoef(mat), index=numeric_cols, columns=numeric_cols)
         
         # Create mask for upper triangle
         mask = np.triu(np.ones_like(corr_matrix), k=1)
@@ -329,10 +478,7 @@ class ResistanceVisualizer:
         
         ax.set_title('🔗 Correlation Matrix: Key Variables', fontsize=16, fontweight='bold', pad=20)
         
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"✅ Saved: {save_path}")
-        plt.close()
+        self._save_figure(save_path)
         
     def create_all_visualizations(self):
         """Generate all visualizations"""
@@ -341,12 +487,22 @@ class ResistanceVisualizer:
         print("="*70)
         print()
         
-        self.plot_temporal_trends()
-        self.plot_geographic_heatmap()
-        self.plot_bacterial_analysis()
-        self.plot_antibiotic_analysis()
-        self.plot_clinical_outcomes()
-        self.plot_correlation_matrix()
+        # fork is offered on macOS too but is unsafe there once system frameworks are loaded
+        if sys.platform.startswith('linux'):
+            # Forked workers share self.df copy-on-write, so nothing is pickled but the method name
+            global _shared_visualizer
+            _shared_visualizer = self
+            try:
+                workers = min(len(PLOT_METHODS), os.cpu_count() or 1)
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=multiprocessing.get_context('fork')) as executor:
+                    list(executor.map(_render_plot, PLOT_METHODS))
+            finally:
+                _shared_visualizer = None
+        else:
+            # pyplot state is not thread-safe, so render in order without fork
+            for method_name in PLOT_METHODS:
+                getattr(self, method_name)()
         
         print()
         print("="*70)
@@ -356,5 +512,5 @@ class ResistanceVisualizer:
 
 
 if __name__ == '__main__':
-    viz = ResistanceVisualizer('data/antibiotic_resistance_surveillance.csv')
+    viz = ResistanceVisualizer('data/antibiotic_resistance_surveillance.parquet')
     viz.create_all_visualizations()
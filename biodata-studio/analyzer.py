@@ -7,10 +7,14 @@ import numpy as np
 import pandas as pd
 from scipy.optimize import curve_fit
 from scipy.integrate import trapezoid
+from scipy.special import expit
 import warnings
 
 warnings.filterwarnings('ignore')
 
+# תבניות לזיהוי עמודת הזמן, לפי סדר עדיפות
+TIME_PATTERNS = ('time', 'hour', 'hr', 'h', 'זמן')
+
 
 class GrowthCurveAnalyzer:
     """מנתח growth curves ומחשב פרמטרים קינטיים"""
@@ -30,6 +34,7 @@ class GrowthCurveAnalyzer:
         
         self.results = None
         self.fitted_curves = {}
+        self._columns_cache = None
     
     def _load_data(self, path):
         """טוען נתונים מקובץ"""
@@ -41,23 +46,26 @@ class GrowthCurveAnalyzer:
             raise ValueError("פורמט לא נתמך. השתמש ב-CSV או Excel")
     
     def _identify_columns(self):
-        """מזהה אוטומטית את עמודות הזמן וה-OD"""
-        cols = self.data.columns.str.lower()
+        """מזהה אוטומטית את עמודות הזמן וה-OD (נשמר בזיכרון לפי שמות העמודות)"""
+        columns = tuple(self.data.columns)
+        if self._columns_cache is not None and self._columns_cache[0] == columns:
+            return self._columns_cache[1]
         
-        # חיפוש עמודת זמן
+        # חיפוש עמודת זמן - לפי סדר העדיפות של התבניות
+        lowered = [str(c).lower() for c in columns]
         time_col = None
-        for pattern in ['time', 'hour', 'hr', 'h', 'זמן']:
-            matches = [c for c in self.data.columns if pattern in c.lower()]
-            if matches:
-                time_col = matches[0]
+        for pattern in TIME_PATTERNS:
+            time_col = next((c for c, name in zip(columns, lowered) if pattern in name), None)
+            if time_col is not None:
                 break
         
         if time_col is None:
-            time_col = self.data.columns[0]  # ברירת מחדל
+            time_col = columns[0]  # ברירת מחדל
         
         # עמודות OD = כל השאר
-        od_cols = [c for c in self.data.columns if c != time_col]
+        od_cols = [c for c in columns if c != time_col]
         
+        self._columns_cache = (columns, (time_col, od_cols))
         return time_col, od_cols
     
     def _calculate_growth_rate(self, time, od):
@@ -79,9 +87,10 @@ class GrowthCurveAnalyzer:
         if len(time_exp) < 2:
             return 0.0, 0.0
         
-        # fit
-        coeffs = np.polyfit(time_exp, log_od_exp, 1)
-        growth_rate = coeffs[0]
+        # fit - closed-form least-squares slope (no Vandermonde/LAPACK as in polyfit)
+        t_centered = time_exp - time_exp.mean()
+        denom = np.dot(t_centered, t_centered)
+        growth_rate = np.dot(t_centered, log_od_exp - log_od_exp.mean()) / denom if denom > 0 else 0.0
         
         # doubling time
         doubling_time = np.log(2) / growth_rate if growth_rate > 0 else np.inf
@@ -89,15 +98,12 @@ class GrowthCurveAnalyzer:
         return growth_rate, doubling_time
     
     def _detect_lag_phase(self, time, od, threshold=0.05):
-        """מזהה lag phase"""
-        max_od = np.max(od)
-        lag_threshold = threshold * max_od
-        
-        for i, val in enumerate(od):
-            if val > lag_threshold:
-                return time[i]
+        """מזהה lag phase לכל הדגימות יחד (od: מטריצה T×K, עמודה לכל דגימה)"""
+        max_od = np.nanmax(od, axis=0)
+        above = od > threshold * max_od  # NaN נחשב כ-False
+        first = above.argmax(axis=0)
         
-        return 0.0
+        return np.where(above.any(axis=0), time[first], 0.0)
     
     def _gompertz_model(self, t, A, mu, lag):
         """Gompertz growth model"""
@@ -107,6 +113,26 @@ class GrowthCurveAnalyzer:
         """Logistic growth model"""
         return A / (1 + np.exp(4 * mu / A * (lag - t) + 2))
     
+    def _gompertz_jac(self, t, A, mu, lag):
+        """Jacobian אנליטי של Gompertz לפי (A, mu, lag)"""
+        d = lag - t
+        u = mu * np.e / A * d + 1
+        f = A * np.exp(-np.exp(u))
+        df_du = -A * np.exp(u - np.exp(u))  # יציב גם כש-exp(u) גולש
+        return np.column_stack((f / A - df_du * mu * np.e * d / A ** 2,
+                                df_du * np.e * d / A,
+                                df_du * mu * np.e / A))
+    
+    def _logistic_jac(self, t, A, mu, lag):
+        """Jacobian אנליטי של Logistic לפי (A, mu, lag)"""
+        d = lag - t
+        v = 4 * mu / A * d + 2
+        s = expit(-v)
+        df_dv = -A * s * expit(v)
+        return np.column_stack((s - df_dv * 4 * mu * d / A ** 2,
+                                df_dv * 4 * d / A,
+                                df_dv * 4 * mu / A))
+    
     def _fit_model(self, time, od, model='gompertz'):
         """מתאים מודל לנתונים"""
         A_guess = np.max(od)
@@ -116,13 +142,15 @@ class GrowthCurveAnalyzer:
         try:
             if model == 'gompertz':
                 popt, _ = curve_fit(self._gompertz_model, time, od,
-                                   p0=[A_guess, mu_guess, lag_guess],
-                                   maxfev=5000, bounds=([0, 0, 0], [np.inf, 1, np.max(time)]))
+                                   p0=[A_guess, mu_guess, lag_guess], jac=self._gompertz_jac,
+                                   x_scale='jac', maxfev=5000,
+                                   bounds=([0, 0, 0], [np.inf, 1, np.max(time)]))
                 fitted = self._gompertz_model(time, *popt)
             elif model == 'logistic':
                 popt, _ = curve_fit(self._logistic_model, time, od,
-                                   p0=[A_guess, mu_guess, lag_guess],
-                                   maxfev=5000, bounds=([0, 0, 0], [np.inf, 1, np.max(time)]))
+                                   p0=[A_guess, mu_guess, lag_guess], jac=self._logistic_jac,
+                                   x_scale='jac', maxfev=5000,
+                                   bounds=([0, 0, 0], [np.inf, 1, np.max(time)]))
                 fitted = self._logistic_model(time, *popt)
             else:
                 return None, None
@@ -148,26 +176,36 @@ class GrowthCurveAnalyzer:
             DataFrame עם כל הפרמטרים
         """
         time_col, od_cols = self._identify_columns()
-        time = self.data[time_col].values
+        time = np.ascontiguousarray(self.data[time_col].to_numpy(), dtype=np.float64)
+        # column-major: כל עקומה (od_matrix[:, k]) רציפה בזיכרון
+        od_matrix = np.asfortranarray(self.data[od_cols].to_numpy(dtype=np.float64))
+        
+        # פרמטרים וקטוריים לכל העמודות במעבר אחד
+        valid = ~np.isnan(od_matrix)
+        n_valid = valid.sum(axis=0)
+        complete = valid.all(axis=0)
+        max_ods = np.nanmax(od_matrix, axis=0)
+        lag_phases = self._detect_lag_phase(time, od_matrix)
+        aucs = np.full(len(od_cols), np.nan)
+        aucs[complete] = trapezoid(od_matrix[:, complete], time, axis=0)
         
         results = []
         
-        for col in od_cols:
-            od = self.data[col].values
+        for k, col in enumerate(od_cols):
+            if n_valid[k] < 3:
+                continue
             
             # נקה NaN
-            valid_idx = ~np.isnan(od)
+            od = od_matrix[:, k]
+            valid_idx = valid[:, k]
             time_clean = time[valid_idx]
             od_clean = od[valid_idx]
             
-            if len(od_clean) < 3:
-                continue
-            
             # חישוב פרמטרים
             growth_rate, doubling_time = self._calculate_growth_rate(time_clean, od_clean)
-            lag_phase = self._detect_lag_phase(time_clean, od_clean)
-            max_od = np.max(od_clean)
-            auc = trapezoid(od_clean, time_clean)
+            lag_phase = lag_phases[k]
+            max_od = max_ods[k]
+            auc = aucs[k] if complete[k] else trapezoid(od_clean, time_clean)
             
             # model fitting
             fit_result, params = self._fit_model(time_clean, od_clean, model=model)
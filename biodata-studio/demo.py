@@ -35,13 +35,13 @@ print("📊 שלב 3: ניתוח סטטיסטי...")
 stats_analyzer = StatisticalAnalyzer(results)
 
 print("\n📈 סיכום סטטיסטי:")
-summary = stats_analyzer.generate_summary_table()
+summary = stats_analyzer.generate_summary_table(decimals=3)
 print(summary)
 print()
 
 # קורלציות
 print("🔗 מטריצת קורלציות:")
-corr_analysis = stats_analyzer.correlation_analysis()
+corr_analysis = stats_analyzer.correlation_analysis(decimals=3)
 print(corr_analysis['correlation_matrix'])
 print()
 
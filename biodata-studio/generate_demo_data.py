@@ -6,35 +6,43 @@ import numpy as np
 import pandas as pd
 
 
-def generate_growth_curve(time, A=1.0, mu=0.3, lag=2.0, noise=0.05):
+def generate_growth_curve(time, A=1.0, mu=0.3, lag=2.0, noise=0.05, rng=None):
     """
     יוצר growth curve סינתטי עם מודל Gompertz
     
+    הפרמטרים עוברים broadcasting: time בצורה (T, 1) ומערכים של K ערכים
+    נותנים מטריצה T×K (עמודה לכל עקומה)
+    
     Args:
         time: וקטור זמן
         A: OD מקסימלי
         mu: growth rate
         lag: lag phase
         noise: רעש (0-1)
+        rng: np.random.Generator (ברירת מחדל: חדש, לא מזורע)
     """
+    rng = rng if rng is not None else np.random.default_rng()
+    
     # Gompertz model
     od = A * np.exp(-np.exp(mu * np.e / A * (lag - time) + 1))
     
-    # הוספת רעש
-    od_with_noise = od + np.random.normal(0, noise * A, size=len(time))
-    od_with_noise = np.maximum(od_with_noise, 0.001)  # מניעת ערכים שליליים
+    # הוספת רעש: קריאה אחת ל-Generator עבור כל הדגימות
+    od += rng.standard_normal(od.shape) * (noise * A)
+    np.maximum(od, 0.001, out=od)  # מניעת ערכים שליליים
     
-    return od_with_noise
+    return od
 
 
-def create_demo_dataset(n_timepoints=20, output_path='demo_data.csv'):
+def create_demo_dataset(n_timepoints=20, output_path='demo_data.csv', seed=None):
     """
     יוצר dataset דמו עם מספר תנאים שונים
     
     Args:
         n_timepoints: מספר נקודות זמן
         output_path: נתיב לשמירה
+        seed: seed למחולל האקראי (None = אקראי)
     """
+    rng = np.random.default_rng(seed)
     time = np.linspace(0, 24, n_timepoints)
     
     data = {'Time (h)': time}
@@ -50,8 +58,13 @@ def create_demo_dataset(n_timepoints=20, output_path='demo_data.csv'):
         'Minimal_Media': {'A': 0.7, 'mu': 0.20, 'lag': 3.5, 'noise': 0.04},
     }
     
-    for condition, params in conditions.items():
-        data[condition] = generate_growth_curve(time, **params)
+    # כל העקומות במעבר אחד: מטריצה T×K (עמודה לכל תנאי)
+    names = list(conditions)
+    A, mu, lag, noise = np.array([[p['A'], p['mu'], p['lag'], p['noise']]
+                                  for p in conditions.values()]).T
+    od = generate_growth_curve(time[:, None], A, mu, lag, noise, rng)
+    
+    data.update({name: od[:, k] for k, name in enumerate(names)})
     
     df = pd.DataFrame(data)
     df.to_csv(output_path, index=False)
@@ -40,7 +40,7 @@ class ReportGenerator:
         
         # טבלאות
         results_html = self.analyzer.results.to_html(index=False, classes='table table-striped')
-        summary_html = self.stats.generate_summary_table().to_html(classes='table table-bordered')
+        summary_html = self.stats.generate_summary_table(decimals=3).to_html(classes='table table-bordered')
         
         # Template
         html_template = """
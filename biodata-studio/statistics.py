@@ -2,22 +2,58 @@
 מודול סטטיסטיקה - ניתוחים סטטיסטיים מתקדמים
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 from scipy import stats
-from statsmodels.stats.multicomp import pairwise_tukeyhsd
-from statsmodels.stats.multitest import multipletests
 
 
 class StatisticalAnalyzer:
     """מבצע ניתוחים סטטיסטיים על תוצאות"""
     
-    def __init__(self, results_df):
+    def __init__(self, results_df, n_jobs=1):
         """
         Args:
             results_df: DataFrame של תוצאות מ-GrowthCurveAnalyzer
+            n_jobs: מספר threads לבדיקות בלתי תלויות על כמה פרמטרים
         """
         self.results = results_df
+        self.n_jobs = n_jobs
+        
+        # אינדקסים מחושבים פעם אחת: שורות לכל דגימה ובלוק מספרי רציף
+        self._sample_codes, self._samples = pd.factorize(self.results['Sample'])
+        self._sample_rows = self.results.groupby('Sample', sort=False).indices
+        self._numeric_cols = self.results.select_dtypes(include=[np.number]).columns
+        self._numeric_block = self.results[self._numeric_cols].to_numpy(dtype=float)
+        self._col_index = {c: k for k, c in enumerate(self._numeric_cols)}
+        self._groups_cache = {}
+    
+    def _values(self, parameter):
+        """עמודת פרמטר כמערך NumPy (מתוך הבלוק המספרי אם אפשר)"""
+        k = self._col_index.get(parameter)
+        return self._numeric_block[:, k] if k is not None else self.results[parameter].to_numpy()
+    
+    def _group_rows(self, samples):
+        """מיקומי השורות של רשימת דגימות, בסדר המקורי"""
+        rows = [self._sample_rows[s] for s in samples if s in self._sample_rows]
+        return np.sort(np.concatenate(rows)) if rows else np.array([], dtype=np.intp)
+    
+    def _extract_groups(self, groups_dict):
+        """
+        שורות ותוויות לכל קבוצה, ממוטמן לפי צורה קנונית של groups_dict
+        
+        Returns:
+            (רשימת מערכי שורות לכל קבוצה, מערך תוויות באורך כל השורות)
+        """
+        # התוויות נשמרות כמו שהן (בלי המרה למחרוזת), כך ש-1 ו-"1" לא מתנגשים במטמון
+        key = tuple((g, tuple(samples)) for g, samples in groups_dict.items())
+        cached = self._groups_cache.get(key)
+        if cached is None:
+            group_rows = [self._group_rows(samples) for samples in groups_dict.values()]
+            group_labels = np.repeat(list(groups_dict), [len(r) for r in group_rows])
+            cached = self._groups_cache[key] = (group_rows, group_labels)
+        return cached
     
     def compare_groups(self, groups_dict, parameter='Growth_Rate (1/h)'):
         """
@@ -30,14 +66,10 @@ class StatisticalAnalyzer:
         Returns:
             dict עם תוצאות ANOVA ו-post-hoc
         """
-        # ארגון הנתונים לפי קבוצות
-        group_data = []
-        group_labels = []
-        
-        for group_name, samples in groups_dict.items():
-            group_values = self.results[self.results['Sample'].isin(samples)][parameter].values
-            group_data.append(group_values)
-            group_labels.extend([group_name] * len(group_values))
+        # ארגון הנתונים לפי קבוצות (האינדקסים ממוטמנים בין פרמטרים)
+        group_rows, group_labels = self._extract_groups(groups_dict)
+        values = self._values(parameter)
+        group_data = [values[rows] for rows in group_rows]
         
         # ANOVA
         f_stat, p_value = stats.f_oneway(*group_data)
@@ -45,10 +77,23 @@ class StatisticalAnalyzer:
         # Post-hoc Tukey HSD (אם יש יותר מ-2 קבוצות)
         posthoc_results = None
         if len(groups_dict) > 2:
+            from statsmodels.stats.multicomp import pairwise_tukeyhsd  # import כבד, רק כשצריך
+            
             all_values = np.concatenate(group_data)
             tukey_result = pairwise_tukeyhsd(all_values, group_labels, alpha=0.05)
-            posthoc_results = pd.DataFrame(data=tukey_result.summary().data[1:],
-                                          columns=tukey_result.summary().data[0])
+            # ישירות מהמערכים של התוצאה, בלי לפרסר את טבלת ה-summary
+            groups = tukey_result.groupsunique
+            # אותו סדר זוגות ש-pairwise_tukeyhsd משתמש בו (משולש עליון, שורה אחר שורה)
+            idx1, idx2 = np.triu_indices(len(groups), k=1)
+            posthoc_results = pd.DataFrame({
+                'group1': groups[idx1],
+                'group2': groups[idx2],
+                'meandiff': tukey_result.meandiffs,
+                'p-adj': tukey_result.pvalues,
+                'lower': tukey_result.confint[:, 0],
+                'upper': tukey_result.confint[:, 1],
+                'reject': tukey_result.reject
+            })
         
         return {
             'anova_f_statistic': f_stat,
@@ -57,47 +102,90 @@ class StatisticalAnalyzer:
             'posthoc': posthoc_results
         }
     
-    def pairwise_comparisons(self, parameter='Growth_Rate (1/h)', correction='bonferroni'):
+    def compare_groups_all(self, groups_dict):
+        """
+        ANOVA בין קבוצות לכל הפרמטרים המספריים בקריאה אחת
+        
+        Args:
+            groups_dict: מילון של {group_name: [sample_names]}
+            
+        Returns:
+            DataFrame לפי פרמטר עם F, p-value ומובהקות
+        """
+        # מערך (n_group × K) לכל קבוצה, ישירות מהבלוק המספרי
+        group_rows, _ = self._extract_groups(groups_dict)
+        group_data = [self._numeric_block[rows] for rows in group_rows]
+        
+        f_stats, p_values = stats.f_oneway(*group_data, axis=0)
+        
+        return pd.DataFrame({
+            'anova_f_statistic': f_stats,
+            'anova_p_value': p_values,
+            'significant': p_values < 0.05
+        }, index=self._numeric_cols)
+    
+    def pairwise_comparisons(self, parameter='Growth_Rate (1/h)', correction='bonferroni', equal_var=True,
+                             decimals=None):
         """
         השוואות pairwise בין כל הדגימות
         
         Args:
             parameter: הפרמטר להשוואה
             correction: שיטת תיקון multiple testing
+            equal_var: True = Student t-test, False = Welch t-test (כמו ב-stats.ttest_ind)
+            decimals: עיגול לתצוגה (None = דיוק מלא)
             
         Returns:
             DataFrame עם תוצאות t-tests
         """
-        samples = self.results['Sample'].unique()
-        comparisons = []
-        
-        for i, sample1 in enumerate(samples):
-            for sample2 in samples[i+1:]:
-                val1 = self.results[self.results['Sample'] == sample1][parameter].values
-                val2 = self.results[self.results['Sample'] == sample2][parameter].values
-                
-                # t-test
-                t_stat, p_val = stats.ttest_ind(val1, val2)
-                
-                # effect size (Cohen's d)
-                pooled_std = np.sqrt((np.std(val1)**2 + np.std(val2)**2) / 2)
-                cohen_d = (np.mean(val1) - np.mean(val2)) / pooled_std if pooled_std > 0 else 0
-                
-                comparisons.append({
-                    'Sample_1': sample1,
-                    'Sample_2': sample2,
-                    'Mean_1': np.mean(val1),
-                    'Mean_2': np.mean(val2),
-                    'Difference': np.mean(val1) - np.mean(val2),
-                    't_statistic': t_stat,
-                    'p_value': p_val,
-                    'cohens_d': cohen_d
-                })
+        # סטטיסטיקה לכל דגימה במעבר אחד (NaN מתפשט כמו ב-ttest_ind)
+        codes, samples = self._sample_codes, self._samples
+        values = self._values(parameter).astype(float, copy=False)
+        n = np.bincount(codes, minlength=len(samples))
+        means = np.bincount(codes, weights=values, minlength=len(samples)) / n
+        ss = np.bincount(codes, weights=(values - means[codes]) ** 2, minlength=len(samples))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = ss / (n - 1)  # שונות מדגמית (ddof=1), משותפת ל-t-test ול-Cohen's d
+        
+        # כל הזוגות (i < j) במטריצה אחת במקום לולאה
+        i, j = np.triu_indices(len(samples), 1)
+        diff = means[i] - means[j]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if equal_var:
+                # Student t-test (שונות משותפת)
+                dof = n[i] + n[j] - 2
+                pooled_var = (ss[i] + ss[j]) / dof
+                t_stat = diff / np.sqrt(pooled_var * (1 / n[i] + 1 / n[j]))
+            else:
+                # Welch t-test עם דרגות חופש Welch–Satterthwaite
+                se2_i = var[i] / n[i]
+                se2_j = var[j] / n[j]
+                dof = (se2_i + se2_j) ** 2 / (se2_i ** 2 / (n[i] - 1) + se2_j ** 2 / (n[j] - 1))
+                t_stat = diff / np.sqrt(se2_i + se2_j)
+            p_val = 2 * stats.t.sf(np.abs(t_stat), dof)
+            
+            # effect size (Cohen's d), עם אותה שונות מדגמית כמו ה-t-test;
+            # NaN כשהוא לא מוגדר (דגימה עם חזרה אחת, או פיזור אפס)
+            pooled_std = np.sqrt((var[i] + var[j]) / 2)
+            cohen_d = np.where(pooled_std > 0, diff / pooled_std, np.nan)
+        
+        comparisons = {
+            'Sample_1': samples[i],
+            'Sample_2': samples[j],
+            'Mean_1': means[i],
+            'Mean_2': means[j],
+            'Difference': diff,
+            't_statistic': t_stat,
+            'p_value': p_val,
+            'cohens_d': cohen_d
+        }
         
         results_df = pd.DataFrame(comparisons)
         
         # Multiple testing correction
         if len(results_df) > 0:
+            from statsmodels.stats.multitest import multipletests  # import כבד, רק כשצריך
+            
             reject, pvals_corrected, _, _ = multipletests(
                 results_df['p_value'], 
                 alpha=0.05, 
@@ -106,35 +194,66 @@ class StatisticalAnalyzer:
             results_df['p_value_corrected'] = pvals_corrected
             results_df['significant'] = reject
         
-        return results_df.round(4)
+        return results_df if decimals is None else results_df.round(decimals)
     
-    def correlation_analysis(self):
+    def pairwise_comparisons_all(self, parameters=None, correction='bonferroni', equal_var=True):
+        """
+        pairwise_comparisons לכמה פרמטרים, במקביל לפי n_jobs
+        
+        Args:
+            parameters: רשימת פרמטרים (ברירת מחדל: כל העמודות המספריות)
+            correction: שיטת תיקון multiple testing
+            equal_var: True = Student t-test, False = Welch t-test
+            
+        Returns:
+            dict של {parameter: DataFrame}
+        """
+        parameters = list(self._numeric_cols if parameters is None else parameters)
+        
+        def run(parameter):
+            return self.pairwise_comparisons(parameter, correction=correction, equal_var=equal_var)
+        
+        # הפרמטרים בלתי תלויים; NumPy/SciPy משחררים את ה-GIL בחישובים הכבדים
+        if self.n_jobs > 1 and len(parameters) > 1:
+            with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+                tables = list(executor.map(run, parameters))
+        else:
+            tables = [run(parameter) for parameter in parameters]
+        
+        return dict(zip(parameters, tables))
+    
+    def correlation_analysis(self, decimals=None):
         """
         ניתוח קורלציות בין פרמטרים שונים
         
+        Args:
+            decimals: עיגול לתצוגה (None = דיוק מלא)
+            
         Returns:
             מטריצת קורלציה + p-values
         """
-        numeric_cols = self.results.select_dtypes(include=[np.number]).columns
+        numeric_cols = self._numeric_cols
         data = self.results[numeric_cols]
         
         # Pearson correlation
         corr_matrix = data.corr()
         
-        # P-values
-        p_values = pd.DataFrame(np.zeros_like(corr_matrix), 
-                               columns=corr_matrix.columns, 
-                               index=corr_matrix.index)
+        # P-values לכל הזוגות יחד, מ-r ומספר התצפיות המשותפות (pairwise complete) של כל זוג
+        r = corr_matrix.to_numpy()
+        present = data.notna().to_numpy(dtype=np.int32)
+        dof = present.T @ present - 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_stat = r * np.sqrt(dof / np.clip(1 - r ** 2, 1e-300, None))
+            p_matrix = 2 * stats.t.sf(np.abs(t_stat), dof)
+        np.fill_diagonal(p_matrix, 0)
+        p_values = pd.DataFrame(p_matrix, columns=corr_matrix.columns, index=corr_matrix.index)
         
-        for i, col1 in enumerate(numeric_cols):
-            for j, col2 in enumerate(numeric_cols):
-                if i != j:
-                    _, p_val = stats.pearsonr(data[col1].dropna(), data[col2].dropna())
-                    p_values.iloc[i, j] = p_val
+        if decimals is not None:
+            corr_matrix, p_values = corr_matrix.round(decimals), p_values.round(decimals)
         
         return {
-            'correlation_matrix': corr_matrix.round(3),
-            'p_values': p_values.round(4)
+            'correlation_matrix': corr_matrix,
+            'p_values': p_values
         }
     
     def outlier_detection(self, parameter='Growth_Rate (1/h)', method='iqr'):
@@ -148,44 +267,44 @@ class StatisticalAnalyzer:
         Returns:
             DataFrame עם דגימות שהן outliers
         """
-        values = self.results[parameter].values
+        values = self._values(parameter)
         
         if method == 'iqr':
-            Q1 = np.percentile(values, 25)
-            Q3 = np.percentile(values, 75)
+            # שני הרבעונים בקריאה אחת; np.quantile בוחר את האיברים ב-partition (O(N)) ולא במיון מלא,
+            # ומבצע אינטרפולציה לינארית כמו np.percentile
+            Q1, Q3 = np.quantile(values, [0.25, 0.75])
             IQR = Q3 - Q1
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
             outliers = (values < lower_bound) | (values > upper_bound)
         
         elif method == 'zscore':
-            z_scores = np.abs(stats.zscore(values))
-            outliers = z_scores > 3
+            std = values.std()
+            outliers = np.abs(values - values.mean()) > 3 * std if std > 0 else np.zeros(len(values), dtype=bool)
         
         else:
             raise ValueError("method חייב להיות 'iqr' או 'zscore'")
         
-        outlier_df = self.results[outliers].copy()
-        outlier_df['outlier_score'] = values[outliers]
+        rows = np.flatnonzero(outliers)
+        outlier_df = self.results.iloc[rows].assign(outlier_score=values[rows])
         
         return outlier_df
     
-    def generate_summary_table(self):
+    def generate_summary_table(self, decimals=None):
         """
         יוצר טבלת סיכום סטטיסטית מלאה
         
+        Args:
+            decimals: עיגול לתצוגה (None = דיוק מלא)
+            
         Returns:
             DataFrame עם סטטיסטיקה מתוארת
         """
-        numeric_cols = self.results.select_dtypes(include=[np.number]).columns
+        numeric_cols = self._numeric_cols
         
-        summary = pd.DataFrame({
-            'Mean': self.results[numeric_cols].mean(),
-            'Median': self.results[numeric_cols].median(),
-            'Std': self.results[numeric_cols].std(),
-            'Min': self.results[numeric_cols].min(),
-            'Max': self.results[numeric_cols].max(),
-            'CV (%)': (self.results[numeric_cols].std() / self.results[numeric_cols].mean() * 100)
-        })
+        # כל הסטטיסטיקות בקריאת agg אחת על הבלוק המספרי
+        summary = self.results[numeric_cols].agg(['mean', 'median', 'std', 'min', 'max']).T
+        summary.columns = ['Mean', 'Median', 'Std', 'Min', 'Max']
+        summary['CV (%)'] = summary['Std'] / summary['Mean'] * 100
         
-        return summary.round(3)
+        return summary if decimals is None else summary.round(decimals)
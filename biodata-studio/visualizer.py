@@ -2,12 +2,22 @@
 מודול ויזואליזציה - גרפים אינטראקטיביים
 """
 
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import numpy as np
 import pandas as pd
 
+# plotly נטען רק כשנוצר Visualizer (ראו _load_plotly), כדי ש-import של המודול יהיה זול
+go = None
+make_subplots = None
+
+
+def _load_plotly():
+    """טוען את plotly פעם אחת לכל תהליך"""
+    global go, make_subplots
+    if go is None:
+        import plotly.graph_objects as graph_objects
+        from plotly.subplots import make_subplots as subplots
+        go, make_subplots = graph_objects, subplots
+
 
 class Visualizer:
     """יוצר ויזואליזציות אינטראקטיביות"""
@@ -17,8 +27,13 @@ class Visualizer:
         Args:
             analyzer: GrowthCurveAnalyzer instance
         """
+        _load_plotly()
         self.analyzer = analyzer
         self.time_col, self.od_cols = analyzer._identify_columns()
+        
+        # מערכי הנתונים הגולמיים נשלפים פעם אחת לכל הגרפים
+        self._time = analyzer.data[self.time_col].to_numpy()
+        self._od = {col: analyzer.data[col].to_numpy() for col in self.od_cols}
     
     def plot_growth_curves(self, show_fitted=True):
         """
@@ -29,10 +44,10 @@ class Visualizer:
         """
         fig = go.Figure()
         
-        time = self.analyzer.data[self.time_col].values
+        time = self._time
         
         for col in self.od_cols:
-            od = self.analyzer.data[col].values
+            od = self._od[col]
             
             # נתונים אמיתיים
             fig.add_trace(go.Scatter(
@@ -74,18 +89,20 @@ class Visualizer:
         if self.analyzer.results is None:
             raise ValueError("רוץ analyze() קודם")
         
+        growth_rates = self.analyzer.results['Growth_Rate (1/h)'].to_numpy()
+        
         fig = go.Figure()
         
         fig.add_trace(go.Bar(
-            x=self.analyzer.results['Sample'],
-            y=self.analyzer.results['Growth_Rate (1/h)'],
+            x=self.analyzer.results['Sample'].to_numpy(),
+            y=growth_rates,
             marker=dict(
-                color=self.analyzer.results['Growth_Rate (1/h)'],
+                color=growth_rates,
                 colorscale='Viridis',
                 showscale=True,
                 colorbar=dict(title="Growth Rate")
             ),
-            text=self.analyzer.results['Growth_Rate (1/h)'].round(3),
+            text=growth_rates.round(3),
             textposition='outside'
         ))
         
@@ -107,20 +124,19 @@ class Visualizer:
         
         # נורמליזציה לכל עמודה
         numeric_cols = ['Max_OD', 'Growth_Rate (1/h)', 'Doubling_Time (h)', 'Lag_Phase (h)', 'AUC']
-        data_normalized = self.analyzer.results[numeric_cols].copy()
-        
-        for col in numeric_cols:
-            min_val = data_normalized[col].min()
-            max_val = data_normalized[col].max()
-            if max_val - min_val > 0:
-                data_normalized[col] = (data_normalized[col] - min_val) / (max_val - min_val)
+        values = self.analyzer.results[numeric_cols].to_numpy(dtype=np.float64)
+        block = values.astype(np.float32)  # float32 מספיק לצבע, וחצי מהנפח ב-JSON של plotly
+        min_val = np.nanmin(block, axis=0)
+        span = np.nanmax(block, axis=0) - min_val
+        scaled = span > 0  # עמודות קבועות נשארות כמו שהן
+        block[:, scaled] = (block[:, scaled] - min_val[scaled]) / span[scaled]
         
         fig = go.Figure(data=go.Heatmap(
-            z=data_normalized.T.values,
+            z=block.T,
             x=self.analyzer.results['Sample'],
             y=numeric_cols,
             colorscale='RdYlGn',
-            text=self.analyzer.results[numeric_cols].T.values.round(2),
+            text=values.T.round(2),
             texttemplate='%{text}',
             textfont={"size": 10},
             colorbar=dict(title="Normalized<br>Value")
@@ -176,20 +192,24 @@ class Visualizer:
                    [{"type": "heatmap"}, {"type": "box"}]]
         )
         
-        # Growth curves
-        time = self.analyzer.data[self.time_col].values
-        for col in self.od_cols[:5]:  # רק 5 ראשונים למען הבהירות
-            od = self.analyzer.data[col].values
-            fig.add_trace(
-                go.Scatter(x=time, y=od, mode='lines+markers', name=col,
-                          showlegend=False),
-                row=1, col=1
-            )
+        # עמודות התוצאות נשלפות פעם אחת
+        results = self.analyzer.results
+        samples = results['Sample'].to_numpy()
+        growth_rates = results['Growth_Rate (1/h)'].to_numpy()
+        doubling_times = results['Doubling_Time (h)'].to_numpy()
+        
+        # Growth curves - כל העקומות בקריאת add_traces אחת
+        curve_cols = self.od_cols[:5]  # רק 5 ראשונים למען הבהירות
+        fig.add_traces(
+            [go.Scatter(x=self._time, y=self._od[col], mode='lines+markers', name=col,
+                        showlegend=False) for col in curve_cols],
+            rows=[1] * len(curve_cols), cols=[1] * len(curve_cols)
+        )
         
         # Growth rates
         fig.add_trace(
-            go.Bar(x=self.analyzer.results['Sample'],
-                  y=self.analyzer.results['Growth_Rate (1/h)'],
+            go.Bar(x=samples,
+                  y=growth_rates,
                   showlegend=False, marker_color='indianred'),
             row=1, col=2
         )
@@ -197,8 +217,8 @@ class Visualizer:
         # Heatmap
         numeric_cols = ['Max_OD', 'Growth_Rate (1/h)', 'AUC']
         fig.add_trace(
-            go.Heatmap(z=self.analyzer.results[numeric_cols].T.values,
-                      x=self.analyzer.results['Sample'],
+            go.Heatmap(z=results[numeric_cols].to_numpy(dtype=np.float32).T,
+                      x=samples,
                       y=numeric_cols,
                       colorscale='Viridis',
                       showscale=False),
@@ -207,7 +227,7 @@ class Visualizer:
         
         # Box plot
         fig.add_trace(
-            go.Box(y=self.analyzer.results['Doubling_Time (h)'],
+            go.Box(y=doubling_times,
                   showlegend=False, marker_color='lightseagreen'),
             row=2, col=2
         )
@@ -1,7 +1,11 @@
 import tkinter as tk
-from tkinter import messagebox, scrolledtext, ttk, filedialog
+from tkinter import messagebox, ttk, filedialog
 import threading 
+import functools
 import webbrowser
+import re
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from unified_client import UnifiedSearchManager
 
 COLORS = {
@@ -14,6 +18,32 @@ COLORS = {
     "frame_bg": "#ffffff"       
 }
 
+# Characters dropped from suggested export filenames (anything but alphanumerics, space, "-" and "_")
+UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\- ]')
+
+# Worker threads hand results to the Tk thread through a queue drained every QUEUE_POLL_MS,
+# at most QUEUE_DRAIN_LIMIT messages per tick
+QUEUE_POLL_MS = 50
+QUEUE_DRAIN_LIMIT = 20
+
+# Results are shown one page of RESULTS_PAGE_SIZE items at a time
+RESULTS_PAGE_SIZE = 20
+
+# ttk styles are global to the Tcl interpreter, so they are configured once per process
+_STYLES_CONFIGURED = False
+
+def _configure_styles_once(master):
+    global _STYLES_CONFIGURED
+    if _STYLES_CONFIGURED:
+        return
+    style = ttk.Style(master)
+    style.theme_use('clam')
+    style.configure("Card.TFrame", background=COLORS["frame_bg"], relief="flat")
+    style.configure("Main.TFrame", background=COLORS["bg_main"])
+    style.configure("Action.TButton", background=COLORS["accent"], foreground="white", font=("Segoe UI", 10, "bold"))
+    style.map("Action.TButton", background=[('active', COLORS["accent_hover"])])
+    _STYLES_CONFIGURED = True
+
 class PubMedApp:
     def __init__(self, root):
         self.root = root
@@ -28,23 +58,27 @@ class PubMedApp:
         
         self.is_searching = False
         self.last_results = []
+        self._shown_results = []
+        self._page = 0
+        self._link_urls = []     # URL of every rendered link, in display order
+        self._link_by_line = {}  # text line number -> URL, for open_link
+        self._io_pool = ThreadPoolExecutor(max_workers=1)  # file writes, kept off the Tk thread
+        self._ui_queue = queue.SimpleQueue()  # (callback, args) for the Tk thread to run
         
         self.source_vars = {}
-        self.available_sources = list(self.client.clients.keys())
+        self.available_sources = tuple(self.client.clients)
+        # Python-side mirror of the checkboxes as a bitmask (bit i = available_sources[i] checked),
+        # so searches never query Tk variables
+        self._source_mask = (1 << len(self.available_sources)) - 1
         for source in self.available_sources:
             self.source_vars[source] = tk.BooleanVar(value=True)
 
-        self._setup_styles()
+        _configure_styles_once(self.root)
         self._setup_ui()
+        # Source checkboxes and text tags are not needed for the first paint
+        self.root.after_idle(self._setup_ui_deferred)
+        self.root.after(QUEUE_POLL_MS, self._drain_queue)
 
-    def _setup_styles(self):
-        style = ttk.Style()
-        style.theme_use('clam')
-        style.configure("Card.TFrame", background=COLORS["frame_bg"], relief="flat")
-        style.configure("Main.TFrame", background=COLORS["bg_main"])
-        style.configure("Action.TButton", background=COLORS["accent"], foreground="white", font=("Segoe UI", 10, "bold"))
-        style.map("Action.TButton", background=[('active', COLORS["accent_hover"])])
-        
     def _setup_ui(self):
         header = tk.Frame(self.root, bg=COLORS["bg_header"], height=70)
         header.pack(fill=tk.X)
@@ -73,61 +107,99 @@ class PubMedApp:
         self.btn_export = ttk.Button(input_frame, text="EXPORT DATA", style="Action.TButton", command=self.export_data, state="disabled")
         self.btn_export.pack(side=tk.LEFT, padx=5)
 
-        filters_frame = ttk.Frame(controls_card, style="Card.TFrame")
-        filters_frame.pack(fill=tk.X, pady=10)
+        self.filters_frame = ttk.Frame(controls_card, style="Card.TFrame")
+        self.filters_frame.pack(fill=tk.X, pady=10)
         
-        ttk.Checkbutton(filters_frame, text="Free Full Text Only (PDF)", variable=self.free_only_var).pack(side=tk.LEFT, padx=10)
-        tk.Label(filters_frame, text="| Sources:", bg="white", fg="gray").pack(side=tk.LEFT, padx=10)
-
-        for src in self.available_sources:
-            ttk.Checkbutton(filters_frame, text=src, variable=self.source_vars[src]).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(self.filters_frame, text="Free Full Text Only (PDF)", variable=self.free_only_var).pack(side=tk.LEFT, padx=10)
+        tk.Label(self.filters_frame, text="| Sources:", bg="white", fg="gray").pack(side=tk.LEFT, padx=10)
 
         self.progress = ttk.Progressbar(main_container, mode='indeterminate')
         
+        page_bar = ttk.Frame(main_container, style="Main.TFrame")
+        page_bar.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 0))
+        self.page_var = tk.StringVar()
+        self.btn_prev = ttk.Button(page_bar, text="◀ Prev", state="disabled", command=lambda: self._render_page(self._page - 1))
+        self.btn_prev.pack(side=tk.LEFT)
+        self.btn_next = ttk.Button(page_bar, text="Next ▶", state="disabled", command=lambda: self._render_page(self._page + 1))
+        self.btn_next.pack(side=tk.RIGHT)
+        tk.Label(page_bar, textvariable=self.page_var, bg=COLORS["bg_main"], fg="gray").pack()
+
         results_card = ttk.Frame(main_container, style="Card.TFrame", padding=2)
         results_card.pack(fill=tk.BOTH, expand=True)
-        self.results_area = scrolledtext.ScrolledText(results_card, font=("Consolas", 11), state='disabled', padx=10, pady=10)
-        self.results_area.pack(fill=tk.BOTH, expand=True)
+        self.results_scroll = ttk.Scrollbar(results_card, orient=tk.VERTICAL)
+        self.results_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.results_area = tk.Text(results_card, font=("Consolas", 11), state='disabled', padx=10, pady=10,
+                                    yscrollcommand=self.results_scroll.set)
+        self.results_area.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.results_scroll.config(command=self.results_area.yview)
+
+        self.status_lbl = tk.Label(self.root, textvariable=self.status_var, bg="#dfe6e9", anchor="w")
+        self.status_lbl.pack(fill=tk.X, side=tk.BOTTOM)
+
+    def _setup_ui_deferred(self):
+        for i, src in enumerate(self.available_sources):
+            ttk.Checkbutton(self.filters_frame, text=src, variable=self.source_vars[src],
+                            command=functools.partial(self._toggle_source, i)).pack(side=tk.LEFT, padx=5)
 
         self.results_area.tag_configure("title", foreground="#2980b9", font=("Segoe UI", 14, "bold"))
         self.results_area.tag_configure("meta", foreground="#7f8c8d", font=("Segoe UI", 10))
         self.results_area.tag_configure("impact", foreground="#e74c3c", font=("Segoe UI", 10, "bold"))
         self.results_area.tag_configure("source", background="#27ae60", foreground="white", font=("Consolas", 9, "bold"))
         self.results_area.tag_configure("link", foreground="blue", underline=True)
-        self.results_area.tag_bind("link", "<Button-1>", lambda e: self.open_link(e))
+        self.results_area.tag_bind("link", "<Button-1>", self.open_link)
 
-        self.status_lbl = tk.Label(self.root, textvariable=self.status_var, bg="#dfe6e9", anchor="w")
-        self.status_lbl.pack(fill=tk.X, side=tk.BOTTOM)
+    def _toggle_source(self, i):
+        # Runs only on a user click, after Tk has already flipped the checkbox
+        self._source_mask ^= 1 << i
 
     def show_context_menu(self, event):
         self.context_menu.tk_popup(event.x_root, event.y_root)
 
     def start_search(self):
+        if self.is_searching: return  # Enter in the entry box bypasses the disabled button
         term = self.search_var.get().strip()
         if not term: return
         
         self.is_searching = True
         self.btn_search.config(state="disabled")
         self.btn_export.config(state="disabled")
-        self.progress.pack(fill=tk.X, pady=(0, 10), in_=self.results_area.master.master)
+        self.progress.pack(side=tk.BOTTOM, fill=tk.X, pady=(0, 10), in_=self.results_area.master, before=self.results_scroll)
         self.progress.start(10)
         
+        self._shown_results = []
+        self._page = 0
+        self._link_urls = []
+        self._link_by_line = {}
+        self._update_page_controls()
         self.results_area.config(state='normal')
         self.results_area.delete(1.0, tk.END)
         self.results_area.config(state='disabled')
         self.status_var.set("Searching... (Ranking by Relevance & Impact)")
         
-        threading.Thread(target=self.run_logic, args=(term,), daemon=True).start()
-
-    def run_logic(self, term):
-        selected = [k for k,v in self.source_vars.items() if v.get()]
+        # Snapshot the filters on the Tk thread; the worker never touches Tk variables
         only_free = self.free_only_var.get()
+        threading.Thread(target=self.run_logic, args=(term, self._source_mask, only_free), daemon=True).start()
+
+    def run_logic(self, term, source_mask, only_free):
+        selected = [s for i, s in enumerate(self.available_sources) if source_mask >> i & 1]
         try:
-            results = self.client.search_all(term, active_sources=selected, limit_per_source=5, only_free=only_free)
+            results = self.client.search_all(term, active_sources=selected, limit_per_source=5, only_free=only_free,
+                                             on_batch=lambda batch: self._ui_queue.put((self._append_results, (batch,))))
             self.last_results = results
-            self.root.after(0, self.finish, results, f"Found {len(results)} items.")
+            self._ui_queue.put((self.finish, (results, f"Found {len(results)} items.")))
         except Exception as e:
-            self.root.after(0, self.finish, [], f"Error: {e}")
+            self._ui_queue.put((self.finish, ([], f"Error: {e}")))
+
+    def _drain_queue(self):
+        # Runs on the Tk thread; workers only ever touch the queue.
+        # Reschedule first so a failing callback cannot stop the polling.
+        self.root.after(QUEUE_POLL_MS, self._drain_queue)
+        for _ in range(QUEUE_DRAIN_LIMIT):
+            try:
+                callback, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            callback(*args)
 
     def finish(self, results, msg):
         self.progress.stop()
@@ -137,46 +209,98 @@ class PubMedApp:
         if results: self.btn_export.config(state="normal")
         self.status_var.set(msg)
         
-        self.results_area.config(state='normal')
+        # Replace the provisional, per-source listing with the final ranked one
+        self._shown_results = results
         if not results:
+            self._link_urls = []
+            self._link_by_line = {}
+            self.results_area.config(state='normal')
+            self.results_area.delete(1.0, tk.END)
             self.results_area.insert(tk.END, "No results found.\nTry broadening your search.")
+            self.results_area.config(state='disabled')
+            self._update_page_controls()
+        else:
+            self._render_page(0)
+
+    def _append_results(self, batch):
+        if not self.is_searching: return  # arrived after finish already rendered the final list
+        shown_before = len(self._shown_results)
+        self._shown_results = self._shown_results + batch
+        self.status_var.set(f"Searching... {len(self._shown_results)} items so far")
+        if self._page == 0 and shown_before < RESULTS_PAGE_SIZE:
+            self._render_page(0)
         else:
-            for i, item in enumerate(results, 1):
-                url = item.get('url', 'N/A')
-                pdf = item.get('pdf_url', 'N/A')
-                citations = item.get('citations', 0)
-                relevance = item.get('relevance_score', 0)
-                
-                abstract = item.get('abstract') or ""
-                short_abstract = (abstract[:50] + '...') if len(abstract) > 50 else abstract
-
-                self.results_area.insert(tk.END, f" {item.get('source')} ", "source")
-                self.results_area.insert(tk.END, f" #{i}  ", "meta")
-                self.results_area.insert(tk.END, f"Impact: {citations} | Rel: {relevance}\n", "impact")
-                self.results_area.insert(tk.END, f"{item.get('title')}\n", "title")
-                
-                # Link separation
-                self.results_area.insert(tk.END, "\n")
-                if url != "N/A":
-                    self.results_area.insert(tk.END, "🔗 Open Article Link\n", ("link", url))
-                if pdf != "N/A" and pdf != "Check Link":
-                    self.results_area.insert(tk.END, "📄 Open PDF Link\n", ("link", pdf))
-                
-                self.results_area.insert(tk.END, f"Journal: {item.get('journal')} | Year: {item.get('year')}\n", "meta")
-                self.results_area.insert(tk.END, f"Authors: {item.get('authors')}\n", "meta")
-                self.results_area.insert(tk.END, f"Abstract: {short_abstract}\n", "text")
-                self.results_area.insert(tk.END, "_"*60 + "\n\n")
+            self._update_page_controls()
+
+    def _page_count(self):
+        return -(-len(self._shown_results) // RESULTS_PAGE_SIZE)
+
+    def _update_page_controls(self):
+        pages = self._page_count()
+        self.page_var.set(f"Page {self._page + 1} of {pages}" if pages else "")
+        self.btn_prev.config(state="normal" if self._page > 0 else "disabled")
+        self.btn_next.config(state="normal" if self._page + 1 < pages else "disabled")
+
+    def _render_page(self, page):
+        # Only the current page lives in the widget, so its size stays bounded
+        self._page = page
+        start = page * RESULTS_PAGE_SIZE
+        batch = self._shown_results[start:start + RESULTS_PAGE_SIZE]
+        self._link_urls = []
 
+        # Collect (text, tags) pairs and hand them to Tk in a single insert call
+        chunks = []
+        for i, item in enumerate(batch, start + 1):
+            get = item.get
+            url = get('url', 'N/A')
+            pdf = get('pdf_url', 'N/A')
+            citations = get('citations', 0)
+            relevance = get('relevance_score', 0)
+            
+            abstract = get('abstract') or ""
+            short_abstract = (abstract[:50] + '...') if len(abstract) > 50 else abstract
+
+            chunks += [f" {get('source')} ", "source",
+                       f" #{i}  ", "meta",
+                       f"Impact: {citations} | Rel: {relevance}\n", "impact",
+                       f"{get('title')}\n", "title"]
+            
+            # Link separation
+            chunks += ["\n", ()]
+            if url != "N/A":
+                chunks += ["🔗 Open Article Link\n", "link"]
+                self._link_urls.append(url)
+            if pdf != "N/A" and pdf != "Check Link":
+                chunks += ["📄 Open PDF Link\n", "link"]
+                self._link_urls.append(pdf)
+            
+            # Adjacent runs with the same tag go in as one chunk
+            chunks += [f"Journal: {get('journal')} | Year: {get('year')}\n"
+                       f"Authors: {get('authors')}\n", "meta",
+                       f"Abstract: {short_abstract}\n", "text",
+                       "_"*60 + "\n\n", ()]
+
+        # Clear and insert inside one normal/disabled window, so Tk
+        # recomputes layout and the scroll region once, at the next idle
+        self.results_area.config(state='normal')
+        self.results_area.delete(1.0, tk.END)
+        self.results_area.insert(tk.END, *chunks)
         self.results_area.config(state='disabled')
+        self._update_page_controls()
+
+        # Every link is one whole line, so map line numbers to URLs in display order
+        # (adjacent link lines share a single "link" range)
+        ranges = self.results_area.tag_ranges("link")
+        link_lines = (line for first, last in zip(ranges[::2], ranges[1::2])
+                      for line in range(int(str(first).split('.')[0]), int(str(last).split('.')[0])))
+        self._link_by_line = dict(zip(link_lines, self._link_urls))
 
     def open_link(self, event):
         try:
             index = self.results_area.index(f"@{event.x},{event.y}")
-            tags = self.results_area.tag_names(index)
-            for tag in tags:
-                if tag.startswith("http"):
-                    webbrowser.open(tag)
-                    return
+            url = self._link_by_line.get(int(index.split('.')[0]))
+            if url:
+                webbrowser.open(url)
         except: pass
 
     def export_data(self):
@@ -191,7 +315,7 @@ class PubMedApp:
         
         def get_filename(ext, type_name):
             default_name = f"{self.search_var.get().strip()}_results"
-            default_name = "".join(x for x in default_name if x.isalnum() or x in " -_")
+            default_name = UNSAFE_FILENAME_CHARS.sub("", default_name)
             return filedialog.asksaveasfilename(
                 initialfile=default_name,
                 defaultextension=ext, 
@@ -201,16 +325,12 @@ class PubMedApp:
         def save_csv():
             f = get_filename(".csv", "CSV Files")
             if f:
-                if self.client.save_to_csv(self.last_results, f):
-                    messagebox.showinfo("Export", "CSV saved successfully!")
-                    export_win.destroy()
+                self._write_export(self.client.save_to_csv, f, "CSV saved successfully!", export_win)
 
         def save_txt():
             f = get_filename(".txt", "Text Files")
             if f:
-                if self.client.save_to_text(self.last_results, f):
-                    messagebox.showinfo("Export", "Text file saved successfully!")
-                    export_win.destroy()
+                self._write_export(self.client.save_to_text, f, "Text file saved successfully!", export_win)
 
         btn_frame = tk.Frame(export_win, bg=COLORS["bg_main"])
         btn_frame.pack(pady=10)
@@ -218,6 +338,21 @@ class PubMedApp:
         ttk.Button(btn_frame, text="Excel / CSV", command=save_csv).pack(side=tk.LEFT, padx=10)
         ttk.Button(btn_frame, text="Readable Text", command=save_txt).pack(side=tk.LEFT, padx=10)
 
+    def _write_export(self, writer, filename, success_msg, export_win):
+        self.status_var.set(f"Saving {filename}...")
+        future = self._io_pool.submit(writer, self.last_results, filename)
+        future.add_done_callback(
+            lambda fut: self._ui_queue.put((self._export_done, (fut.result(), filename, success_msg, export_win))))
+
+    def _export_done(self, ok, filename, success_msg, export_win):
+        if not ok:
+            self.status_var.set(f"Could not save {filename}.")
+            return
+        self.status_var.set(f"Saved {filename}.")
+        messagebox.showinfo("Export", success_msg)
+        if export_win.winfo_exists():
+            export_win.destroy()
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = PubMedApp(root)
@@ -1,15 +1,22 @@
 import requests
 import xml.etree.ElementTree as ET
 
+try:
+    import orjson  # optional, faster JSON decoding
+except ImportError:
+    orjson = None
+
 class NCBIClient:
     """
     Handles interactions with the NCBI Entrez API (E-utilities).
     """
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
-    def __init__(self, api_key=None, tool_name="science_fetcher"):
+    def __init__(self, api_key=None, tool_name="science_fetcher", session=None):
         self.api_key = api_key
         self.tool_name = tool_name
+        # Reusing one session keeps the connection to eutils alive between esearch and efetch
+        self.session = session if session is not None else requests.Session()
 
     def _get_base_params(self):
         # NCBI requires a tool parameter and email is recommended
@@ -31,9 +38,9 @@ class NCBIClient:
         })
 
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content) if orjson else response.json()
             return data.get("esearchresult", {}).get("idlist", [])
         except Exception as e:
             print(f"NCBI Search Error: {e}")
@@ -52,51 +59,60 @@ class NCBIClient:
         })
 
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             # Parse complex XML from PubMed
             root = ET.fromstring(response.content)
-            results = []
-
-            for article in root.findall(".//PubmedArticle"):
-                # Title
-                title = article.findtext(".//ArticleTitle") or "No Title"
-                journal = article.findtext(".//Journal/Title") or "Unknown Journal"
-                
-                # PMID
-                pmid = article.findtext(".//MedlineCitation/PMID")
-                
-                # Year logic
-                year = article.findtext(".//Journal/JournalIssue/PubDate/Year")
-                if not year:
-                    year = article.findtext(".//PubDate/MedlineDate")
-                
-                # Abstract
-                abstract_texts = article.findall(".//AbstractText")
-                full_abstract = " ".join(["".join(t.itertext()) for t in abstract_texts])
-                if not full_abstract:
-                    full_abstract = "No Abstract Available."
-
-                # Authors
-                authors = []
-                for author in article.findall(".//Author"):
-                    last = author.findtext("LastName")
-                    initials = author.findtext("Initials")
-                    if last and initials:
-                        authors.append(f"{last} {initials}")
-                
-                results.append({
-                    "pmid": pmid,
-                    "title": title,
-                    "journal": journal,
-                    "year": year,
-                    "authors": ", ".join(authors),
-                    "abstract": full_abstract
-                })
+            results = [self._parse_article(article) for article in root.iterfind("PubmedArticle")]
             
             return results
 
         except Exception as e:
             print(f"NCBI Fetch Error: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    def _parse_article(article):
+        # Fixed PubMed layout: look fields up by direct child paths instead of scanning all descendants
+        citation = article.find("MedlineCitation")
+        if citation is None:
+            citation = article
+        details = citation.find("Article")
+        if details is None:
+            details = citation
+        
+        # Title
+        title = details.findtext("ArticleTitle") or "No Title"
+        journal = details.findtext("Journal/Title") or "Unknown Journal"
+        
+        # PMID
+        pmid = citation.findtext("PMID")
+        
+        # Year logic
+        year = details.findtext("Journal/JournalIssue/PubDate/Year")
+        if not year:
+            year = details.findtext("Journal/JournalIssue/PubDate/MedlineDate")
+        
+        # Abstract (also picks up OtherAbstract sections, hence the descendant search)
+        abstract_texts = citation.findall(".//AbstractText")
+        full_abstract = " ".join(["".join(t.itertext()) for t in abstract_texts])
+        if not full_abstract:
+            full_abstract = "No Abstract Available."
+
+        # Authors
+        authors = []
+        for author in details.findall("AuthorList/Author"):
+            last = author.findtext("LastName")
+            initials = author.findtext("Initials")
+            if last and initials:
+                authors.append(f"{last} {initials}")
+        
+        return {
+            "pmid": pmid,
+            "title": title,
+            "journal": journal,
+            "year": year,
+            "authors": ", ".join(authors),
+            "abstract": full_abstract
+        }
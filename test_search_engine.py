@@ -1,7 +1,10 @@
 import pytest
 import csv
+import json
 import os
 import requests
+import threading
+import unified_client
 from unified_client import UnifiedSearchManager
 from ncbi_client import NCBIClient
 
@@ -63,7 +66,7 @@ def test_long_text_stress(manager, monkeypatch, tmp_path):
         row = next(csv.DictReader(f))
         assert len(row['abstract']) > 5000
 
-def test_zero_results(manager, monkeypatch):
+def test_zero_results(manager, monkeypatch, tmp_path):
     """Test 3: Handle zero results"""
     for client_name in manager.clients:
         monkeypatch.setattr(manager.clients[client_name], "search", lambda *a, **k: [])
@@ -71,7 +74,7 @@ def test_zero_results(manager, monkeypatch):
     results = manager.search_all("Xylophone_123")
     assert len(results) == 0
     # Should not crash on save
-    manager.save_to_csv(results, "empty.csv")
+    manager.save_to_csv(results, tmp_path / "empty.csv")
 
 def test_csv_formatting_integrity(manager, tmp_path):
     """Test 4: Handle commas in title"""
@@ -156,4 +159,144 @@ def test_date_range_logic(manager, monkeypatch):
 
     monkeypatch.setattr(manager.clients["PubMed"], "search", mock_search)
     manager.search_all("test", active_sources=["PubMed"], start_year=2020)
-    assert received_year['year'] == 2020
\ No newline at end of file
+    assert received_year['year'] == 2020
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.payload = payload or {}
+        self.content = json.dumps(self.payload).encode()
+
+    def json(self):
+        return self.payload
+
+def fake_work(doi):
+    return {"doi": f"https://doi.org/{doi}", "cited_by_count": 7,
+            "abstract_inverted_index": {"Enriched": [0], "abstract": [1]}, "open_access": {"oa_url": "N/A"}}
+
+def test_enrichment_survives_bad_doi(manager, monkeypatch):
+    """Test 11: One bad DOI in a batch does not drop enrichment for the others"""
+    dois = [f"10.1000/paper{i}" for i in range(49)] + ["10.1000/bad"]
+    requested = []
+
+    def mock_get(url, params=None, timeout=None):
+        requested.append((url, params))
+        if params:  # batch doi filter: OpenAlex rejects the whole request because of one DOI
+            return FakeResponse(400)
+        doi = url.split("https://doi.org/", 1)[1]
+        return FakeResponse(404) if doi == "10.1000/bad" else FakeResponse(200, fake_work(doi))
+    monkeypatch.setattr(unified_client.HTTP_SESSION, "get", mock_get)
+
+    items = [{"title": d, "doi": d, "citations": 0, "abstract": "", "pdf_url": "N/A"} for d in dois]
+    manager._enrich_missing_data(items)
+
+    assert all(item["citations"] == 7 for item in items[:49])
+    assert items[49]["citations"] == 0
+    assert sum(1 for _, params in requested if params) == 1
+
+def test_enrichment_skips_filter_syntax_in_batch(manager, monkeypatch):
+    """Test 12: DOIs containing filter metacharacters are looked up individually"""
+    dois = ["10.1000/a", "10.1000/b|c", "10.1000/d,e"]
+    batch_filters = []
+
+    def mock_get(url, params=None, timeout=None):
+        if params:
+            batch_filters.append(params["filter"])
+            listed = params["filter"][len("doi:"):].split("|")
+            return FakeResponse(200, {"results": [fake_work(d) for d in listed]})
+        return FakeResponse(200, fake_work(url.split("https://doi.org/", 1)[1]))
+    monkeypatch.setattr(unified_client.HTTP_SESSION, "get", mock_get)
+
+    items = [{"title": d, "doi": d, "citations": 0, "abstract": "", "pdf_url": "N/A"} for d in dois]
+    manager._enrich_missing_data(items)
+
+    assert batch_filters == ["doi:10.1000/a"]
+    assert all(item["citations"] == 7 for item in items)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+def test_response_cache_ttl_and_copies(manager, monkeypatch):
+    """Test 13: Cached source results expire after the TTL and are handed out as copies"""
+    clock = FakeClock()
+    monkeypatch.setattr(unified_client, "time", clock)
+    calls = []
+
+    def mock_search(*args, **kwargs):
+        calls.append(1)
+        return [{"title": "Cached Paper", "source": "OpenAlex", "citations": 3}]
+    monkeypatch.setattr(manager.clients["OpenAlex"], "search", mock_search)
+
+    first = manager.search_all("cache", active_sources=["OpenAlex"])
+    first[0]["title"] = "Mutated by caller"
+    second = manager.search_all("cache", active_sources=["OpenAlex"])
+    assert len(calls) == 1
+    assert second[0]["title"] == "Cached Paper"
+
+    clock.now += unified_client.RESPONSE_CACHE_TTL + 1
+    manager.search_all("cache", active_sources=["OpenAlex"])
+    assert len(calls) == 2
+
+def test_response_cache_evicts_least_recently_used(manager, monkeypatch):
+    """Test 14: The response cache keeps at most RESPONSE_CACHE_SIZE entries, dropping the LRU one"""
+    monkeypatch.setattr(unified_client, "RESPONSE_CACHE_SIZE", 2)
+    manager._cache_put("a", 1)
+    manager._cache_put("b", 2)
+    assert manager._cache_get("a") == 1  # "b" is now least recently used
+    manager._cache_put("c", 3)
+    assert manager._cache_get("b") is None
+    assert manager._cache_get("a") == 1
+    assert manager._cache_get("c") == 3
+
+class FakeClient:
+    def __init__(self, papers):
+        self.papers = papers
+
+    def search(self, term, start_year=None, max_results=5, only_free=False):
+        return [dict(paper) for paper in self.papers]
+
+def test_search_streams_batches(manager, monkeypatch):
+    """Test 15: on_batch receives each source's scored results before the final merged list"""
+    first_batch = threading.Event()
+    slow_done = threading.Event()
+
+    class SlowClient(FakeClient):
+        def search(self, *args, **kwargs):
+            # Only answers once the fast source's batch has been delivered (or gives up after 2s)
+            first_batch.wait(timeout=2)
+            slow_done.set()
+            return super().search(*args, **kwargs)
+
+    monkeypatch.setattr(manager, "clients", {
+        "PubMed": FakeClient([{"title": "Streamed Cancer Paper", "source": "PubMed", "citations": 5}]),
+        "OpenAlex": SlowClient([{"title": "Another Cancer Study", "source": "OpenAlex", "citations": 9},
+                                {"title": "Unrelated", "source": "OpenAlex", "citations": 1}]),
+        "Empty": FakeClient([]),
+    })
+    batches = []
+    slow_done_at_batch = []
+
+    def on_batch(batch):
+        slow_done_at_batch.append(slow_done.is_set())
+        batches.append(batch)
+        first_batch.set()
+    results = manager.search_all("cancer", on_batch=on_batch)
+
+    assert [len(batch) for batch in batches] == [1, 2]  # fast source first; empty sources are not streamed
+    assert slow_done_at_batch == [False, True]  # the fast batch did not wait for the slow source
+    assert all("relevance_score" in paper for batch in batches for paper in batch)
+    assert {p["title"] for batch in batches for p in batch} == {p["title"] for p in results}
+    assert results[-1]["title"] == "Unrelated"
+
+def test_extract_year_odd_values(manager):
+    """Test 16: Year extraction tolerates numeric junk instead of raising"""
+    assert manager._extract_year(2015) == "2015"
+    assert manager._extract_year(2015.0) == "2015"
+    assert manager._extract_year("2020 May") == "2020"
+    assert manager._extract_year(float("nan")) == "N/A"
+    assert manager._extract_year(float("inf")) == "N/A"
+    assert manager._extract_year(True) == "N/A"
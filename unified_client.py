@@ -1,17 +1,76 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import concurrent.futures
 import datetime
+import itertools
+import math
+import threading
+import time
+from collections import OrderedDict
+from operator import itemgetter
 import csv
 import re
 from ncbi_client import NCBIClient
 
+try:
+    import orjson  # optional, faster decoding of the large JSON payloads
+except ImportError:
+    orjson = None
+
+# Everything except Unicode alphanumerics; stripped when comparing titles
+NON_ALNUM = re.compile(r'[\W_]+')
+
+# First four-digit run in a date string is taken as the year
+YEAR_PATTERN = re.compile(r'\d{4}')
+
+# Write buffer for exports, so large files go out in a few big writes
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# OpenAlex works endpoint; enrichment resolves up to OPENALEX_DOI_BATCH DOIs per request
+OPENALEX_WORKS_URL = "https://api.openalex.org/works"
+OPENALEX_DOI_BATCH = 50
+# DOIs containing these would break the doi:a|b filter syntax
+OPENALEX_FILTER_CHARS = re.compile(r'[|,]')
+
+# Parsed per-source results and OpenAlex works are memoised for RESPONSE_CACHE_TTL seconds
+# (at most RESPONSE_CACHE_SIZE entries, least recently used evicted first)
+RESPONSE_CACHE_TTL = 3600
+RESPONSE_CACHE_SIZE = 256
+
+# One pooled, keep-alive session shared by every client (connections are reused per host)
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.headers.update({"User-Agent": "science-fetcher/1.0"})
+# Pool sized for the fetch pool's concurrency; rate limits and transient 5xx answers are retried
+# with short exponential backoff. Retry-After is ignored: a server asking for minutes would stall
+# the search far beyond the per-request timeouts. A read timeout is not retried (a server that
+# already used the whole timeout is unlikely to answer faster) and a failed connect only once,
+# so a slow source costs about two timeouts, not four
+_retry = Retry(total=3, connect=1, read=0, backoff_factor=0.4, status_forcelist=(429, 500, 502, 503, 504),
+               allowed_methods=frozenset(["GET"]), respect_retry_after_header=False)
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_retry)
+HTTP_SESSION.mount("http://", _adapter)
+HTTP_SESSION.mount("https://", _adapter)
+
+def parse_json(response):
+    """Decode a JSON response body, with orjson when it is installed"""
+    return orjson.loads(response.content) if orjson else response.json()
+
 def get_current_year():
     return datetime.datetime.now().year
 
+def abstract_from_inverted_index(abs_idx):
+    """Rebuild an OpenAlex abstract ({word: [positions]}) by placing each word at its position"""
+    words = [""] * (max((max(positions) for positions in abs_idx.values() if positions), default=-1) + 1)
+    for word, positions in abs_idx.items():
+        for pos in positions:
+            words[pos] = word
+    return " ".join(filter(None, words))  # skip unused positions
+
 # --- 1. PubMed Wrapper ---
 class PubMedWrapper:
     def __init__(self):
-        self.client = NCBIClient()
+        self.client = NCBIClient(session=HTTP_SESSION)
     
     def search(self, term, start_year=None, max_results=5, only_free=False):
         try:
@@ -52,7 +111,7 @@ class SemanticScholarClient:
             params["year"] = f"{start_year}-{get_current_year()}"
         
         try:
-            r = requests.get(self.BASE_URL, params=params, headers={"User-Agent": "Bot"}, timeout=10).json()
+            r = parse_json(HTTP_SESSION.get(self.BASE_URL, params=params, headers={"User-Agent": "Bot"}, timeout=10))
             results = self._parse(r)
             if only_free:
                 return [r for r in results if r['pdf_url'] != "N/A"]
@@ -93,7 +152,7 @@ class EuropePmcClient:
 
         params = {"query": query, "format": "json", "pageSize": max_results}
         try:
-            return self._parse(requests.get(self.BASE_URL, params=params, timeout=10).json())
+            return self._parse(parse_json(HTTP_SESSION.get(self.BASE_URL, params=params, timeout=10)))
         except: return []
 
     def _parse(self, data):
@@ -143,7 +202,7 @@ class OpenAlexClient:
                 "filter": filters,
                 "sort": "cited_by_count:desc"
             }
-            return self._parse(requests.get(self.BASE_URL, params=params, timeout=10).json())
+            return self._parse(parse_json(HTTP_SESSION.get(self.BASE_URL, params=params, timeout=10)))
         except: return []
 
     def _parse(self, data):
@@ -154,8 +213,7 @@ class OpenAlexClient:
             abs_idx = i.get("abstract_inverted_index")
             abstract = "Abstract Available at Source."
             if abs_idx:
-                word_list = sorted([(pos, w) for w, positions in abs_idx.items() for pos in positions])
-                abstract = " ".join([w[1] for w in word_list])
+                abstract = abstract_from_inverted_index(abs_idx)
             
             url = i.get("ids", {}).get("openalex", i.get("id"))
             doi = i.get("doi")
@@ -187,7 +245,7 @@ class PlosClient:
             if start_year:
                  q += f' AND publication_date:[{start_year}-01-01T00:00:00Z TO *]'
             
-            r = requests.get(self.BASE_URL, params={"q": q, "wt":"json", "rows":max_results, "fl":"id,title,journal,author_display,abstract,publication_date,score"}, timeout=10).json()
+            r = parse_json(HTTP_SESSION.get(self.BASE_URL, params={"q": q, "wt":"json", "rows":max_results, "fl":"id,title,journal,author_display,abstract,publication_date,score"}, timeout=10))
             return self._parse(r)
         except: return []
     
@@ -215,6 +273,8 @@ class PlosClient:
 
 # --- MAIN MANAGER ---
 class UnifiedSearchManager:
+    CSV_FIELDS = ("source", "title", "citations", "relevance_score", "year", "journal", "authors", "url", "pdf_url", "abstract")
+
     def __init__(self):
         self.clients = {
             "PubMed": PubMedWrapper(),
@@ -232,20 +292,48 @@ class UnifiedSearchManager:
             "PLOS"
         ]
 
+        # Long-lived I/O pool shared by the source fetches and the enrichment lookups,
+        # so threads are created once instead of twice per search
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=10, thread_name_prefix="fetch")
+        self._response_cache = OrderedDict()  # key -> (timestamp, value)
+        self._cache_lock = threading.Lock()  # searches may run concurrently on several threads
+
+    def _cache_get(self, key):
+        with self._cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            timestamp, value = entry
+            if time.monotonic() - timestamp > RESPONSE_CACHE_TTL:
+                del self._response_cache[key]
+                return None
+            self._response_cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, key, value):
+        with self._cache_lock:
+            self._response_cache[key] = (time.monotonic(), value)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
     def _extract_year(self, date_str):
-        # Fix decimal year issue (2015.0 -> 2015)
         if not date_str: return "N/A"
-        try:
-            return str(int(float(str(date_str))))
-        except:
-            match = re.search(r'\d{4}', str(date_str))
-            return match.group(0) if match else "N/A"
+        # Numbers directly (2015.0 -> 2015); strings such as "2015", "2015.0" or "2020 May" via the regex.
+        # bool, NaN and inf fall through to the regex, which finds no year in them
+        if isinstance(date_str, int) and not isinstance(date_str, bool):
+            return str(date_str)
+        if isinstance(date_str, float) and math.isfinite(date_str):
+            return str(int(date_str))
+        match = YEAR_PATTERN.search(str(date_str))
+        return match.group(0) if match else "N/A"
 
-    def calculate_score(self, paper, query):
+    def calculate_score(self, paper, query, query_terms=None):
         score = 0
         if not query: return 0
         
-        query_terms = query.lower().split()
+        if query_terms is None:
+            query_terms = query.lower().split()
         title_lower = (paper.get('title') or '').lower()
         abstract_lower = (paper.get('abstract') or '').lower()
 
@@ -264,54 +352,66 @@ class UnifiedSearchManager:
             
         return score
 
-    def search_all(self, term, active_sources=None, limit_per_source=5, start_year=None, only_free=False):
+    def search_all(self, term, active_sources=None, limit_per_source=5, start_year=None, only_free=False,
+                   on_batch=None):
+        """Merged, enriched results ranked by relevance; on_batch(items) gets each source's scored results as they arrive"""
         if active_sources is None: active_sources = self.clients.keys()
         
         if start_year is None:
             start_year = get_current_year() - 10
 
         all_results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_source = {}
-            for name in active_sources:
-                if name in self.clients:
-                    future_to_source[executor.submit(self.clients[name].search, term, start_year, limit_per_source, only_free)] = name
-            
-            for future in concurrent.futures.as_completed(future_to_source):
-                try:
-                    data = future.result()
-                    all_results.extend(data)
-                except Exception: pass
+        cached_batches = []
+        future_to_key = {}
+        for name in active_sources:
+            if name in self.clients:
+                key = ("search", name, term, start_year, limit_per_source, only_free)
+                cached = self._cache_get(key)
+                if cached is not None:
+                    cached_batches.append([dict(paper) for paper in cached])
+                else:
+                    future_to_key[self._executor.submit(self.clients[name].search, term, start_year, limit_per_source, only_free)] = key
+        
+        fetched = (self._fetched_batch(future, future_to_key[future])
+                   for future in concurrent.futures.as_completed(future_to_key))
+        # chain, not unpacking: each fetched batch must reach on_batch as soon as its source answers
+        for data in itertools.chain(cached_batches, fetched):
+            if not data: continue
+            all_results.extend(data)
+            if on_batch:
+                # Score copies so the merge/enrich pass below still sees the raw items
+                on_batch(self._score([dict(paper) for paper in data], term))
 
         merged = self._merge_and_deduplicate(all_results)
         enriched = self._enrich_missing_data(merged)
         
         # --- Scoring & Sorting ---
-        for paper in enriched:
-            paper['year'] = self._extract_year(paper.get('year'))
-            paper['relevance_score'] = self.calculate_score(paper, term)
-            cites = paper.get('citations')
-            if not isinstance(cites, int):
-                paper['citations'] = 0
+        self._score(enriched, term)
 
         # Sort: Relevance DESC, then Citations DESC
-        enriched.sort(key=lambda x: (-x['relevance_score'], -x['citations']))
+        enriched.sort(key=itemgetter('relevance_score', 'citations'), reverse=True)
         
         return enriched
 
+    def _score(self, papers, term):
+        query_terms = term.lower().split() if term else ()  # split once, not per paper
+        for paper in papers:
+            paper['year'] = self._extract_year(paper.get('year'))
+            paper['relevance_score'] = self.calculate_score(paper, term, query_terms)
+            cites = paper.get('citations')
+            if not isinstance(cites, int):
+                paper['citations'] = 0
+        return papers
+
     def _merge_and_deduplicate(self, all_items):
-        def get_priority(item):
-            src = item.get('source', '')
-            if src in self.priority_order:
-                return self.priority_order.index(src)
-            return 99
-        
-        all_items.sort(key=get_priority)
+        # Rank lookup built once per merge instead of a list scan (in + index) per item
+        rank = {src: i for i, src in enumerate(self.priority_order)}
+        all_items.sort(key=lambda item: rank.get(item.get('source', ''), 99))
         final_list = []
         seen_titles = set()
         
         def normalize(text): 
-            return "".join(e for e in str(text) if e.isalnum()).lower()
+            return NON_ALNUM.sub("", str(text)).lower()
 
         for item in all_items:
             title = item.get('title', '')
@@ -323,42 +423,102 @@ class UnifiedSearchManager:
                 final_list.append(item)
         return final_list
 
+    def _fetched_batch(self, future, key):
+        try:
+            data = future.result()
+        except Exception:
+            return []
+        # Later passes mutate the items, so the cache keeps its own copies.
+        # Empty answers are not cached (clients return [] on errors too)
+        if data:
+            self._cache_put(key, [dict(paper) for paper in data])
+        return data
+
     def _enrich_missing_data(self, results):
-        for item in results:
-            doi = item.get('doi')
-            abstract_text = item.get('abstract') or ""
-            needs_abstract = len(abstract_text) < 50
-            needs_citations = item.get('citations') == 0
-            
-            if (needs_abstract or needs_citations) and doi:
-                try:
-                    clean_doi = doi.replace("https://doi.org/", "")
-                    url = f"https://api.openalex.org/works/https://doi.org/{clean_doi}"
-                    r = requests.get(url, timeout=3)
-                    if r.status_code == 200:
-                        data = r.json()
-                        if needs_abstract:
-                            abs_idx = data.get("abstract_inverted_index")
-                            if abs_idx:
-                                word_list = sorted([(pos, w) for w, positions in abs_idx.items() for pos in positions])
-                                new_abstract = " ".join([w[1] for w in word_list])
-                                item['abstract'] = new_abstract + " [Enriched]"
-                        if item.get('pdf_url') == "N/A":
-                             item['pdf_url'] = data.get("open_access", {}).get("oa_url", "N/A")
-                        if needs_citations:
-                             item['citations'] = data.get("cited_by_count", 0)
-                except Exception: pass
+        # Look the DOIs up in batches through OpenAlex's doi filter (one request per
+        # OPENALEX_DOI_BATCH papers); the batches themselves run concurrently
+        targets = [(item, self._clean_doi(item['doi'])) for item in results if self._needs_enrichment(item)]
+        dois = list(dict.fromkeys(doi for _, doi in targets))
+
+        works_by_doi = {}
+        missing = []
+        for doi in dois:
+            work = self._cache_get(("work", doi))
+            if work is not None:
+                works_by_doi[doi] = work
+            else:
+                missing.append(doi)
+        # DOIs containing filter syntax cannot go into a doi:a|b filter; look those up one by one
+        batchable = [doi for doi in missing if not OPENALEX_FILTER_CHARS.search(doi)]
+        single = [doi for doi in missing if OPENALEX_FILTER_CHARS.search(doi)]
+        batches = [batchable[i:i + OPENALEX_DOI_BATCH] for i in range(0, len(batchable), OPENALEX_DOI_BATCH)]
+
+        fetched = {}
+        for batch, found in zip(batches, self._executor.map(self._fetch_works_by_doi, batches)):
+            if found is None:
+                single.extend(batch)  # failed batch: fall back to per-DOI lookups so one bad DOI loses only itself
+            else:
+                fetched.update(found)
+        for doi, work in zip(single, self._executor.map(self._fetch_work_by_doi, single)):
+            if work is not None:
+                fetched[doi] = work
+
+        works_by_doi.update(fetched)
+        for doi, work in fetched.items():
+            self._cache_put(("work", doi), work)
+
+        for item, doi in targets:
+            data = works_by_doi.get(doi)
+            if data:
+                self._apply_enrichment(item, data)
         return results
 
+    @staticmethod
+    def _clean_doi(doi):
+        return doi.replace("https://doi.org/", "").lower()
+
+    @staticmethod
+    def _needs_enrichment(item):
+        abstract_text = item.get('abstract') or ""
+        return bool(item.get('doi')) and (len(abstract_text) < 50 or item.get('citations') == 0)
+
+    def _fetch_works_by_doi(self, dois):
+        """{doi: work} for one doi-filter batch, or None if the batch request failed"""
+        try:
+            params = {"filter": "doi:" + "|".join(dois), "per-page": len(dois)}
+            r = HTTP_SESSION.get(OPENALEX_WORKS_URL, params=params, timeout=10)
+            if r.status_code == 200:
+                return {self._clean_doi(w["doi"]): w for w in parse_json(r).get("results", []) if w.get("doi")}
+        except Exception: pass
+        return None
+
+    def _fetch_work_by_doi(self, doi):
+        try:
+            r = HTTP_SESSION.get(f"{OPENALEX_WORKS_URL}/https://doi.org/{doi}", timeout=3)
+            if r.status_code == 200:
+                return parse_json(r)
+        except Exception: pass
+        return None
+
+    def _apply_enrichment(self, item, data):
+        abstract_text = item.get('abstract') or ""
+        if len(abstract_text) < 50:
+            abs_idx = data.get("abstract_inverted_index")
+            if abs_idx:
+                item['abstract'] = abstract_from_inverted_index(abs_idx) + " [Enriched]"
+        if item.get('pdf_url') == "N/A":
+             item['pdf_url'] = data.get("open_access", {}).get("oa_url", "N/A")
+        if item.get('citations') == 0:
+             item['citations'] = data.get("cited_by_count", 0)
+
     def save_to_csv(self, data, filename):
-        keys = ["source", "title", "citations", "relevance_score", "year", "journal", "authors", "url", "pdf_url", "abstract"]
+        """Save results as CSV; data may be any iterable of result dicts (rows are streamed)"""
+        keys = self.CSV_FIELDS
         try:
-            with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.DictWriter(f, fieldnames=keys)
-                writer.writeheader()
-                for item in data:
-                    filtered_item = {k: item.get(k, "N/A") for k in keys}
-                    writer.writerow(filtered_item)
+            with open(filename, 'w', newline='', encoding='utf-8-sig', buffering=EXPORT_BUFFER_SIZE) as f:
+                writer = csv.writer(f)
+                writer.writerow(keys)
+                writer.writerows([item.get(k, "N/A") for k in keys] for item in data)
             return True
         except Exception as e:
             print(f"CSV Error: {e}")
@@ -367,17 +527,20 @@ class UnifiedSearchManager:
     def save_to_text(self, data, filename):
         """Save results as a readable text file"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write("SCIENTIFIC SEARCH RESULTS\n")
-                f.write("=========================\n\n")
-                for i, item in enumerate(data, 1):
-                    f.write(f"Result #{i}\n")
-                    f.write(f"Title: {item.get('title')}\n")
-                    f.write(f"Source: {item.get('source')} | Year: {item.get('year')}\n")
-                    f.write(f"Citations: {item.get('citations')} | Relevance: {item.get('relevance_score')}\n")
-                    f.write(f"Link: {item.get('url')}\n")
-                    f.write(f"Abstract: {item.get('abstract')}\n")
-                    f.write("-" * 50 + "\n\n")
+            # Build the whole report first, then hand it to the file in one write
+            parts = ["SCIENTIFIC SEARCH RESULTS\n", "=========================\n\n"]
+            for i, item in enumerate(data, 1):
+                parts.append(
+                    f"Result #{i}\n"
+                    f"Title: {item.get('title')}\n"
+                    f"Source: {item.get('source')} | Year: {item.get('year')}\n"
+                    f"Citations: {item.get('citations')} | Relevance: {item.get('relevance_score')}\n"
+                    f"Link: {item.get('url')}\n"
+                    f"Abstract: {item.get('abstract')}\n"
+                    + "-" * 50 + "\n\n"
+                )
+            with open(filename, 'w', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as f:
+                f.write("".join(parts))
             return True
         except Exception as e:
             print(f"TXT Error: {e}")